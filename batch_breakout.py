@@ -0,0 +1,106 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import breakout017 as breakout
+
+MAX_TICKS = 60 * 60 * 60  # One simulated hour at 60 Hz before a game is called off
+
+# Policy name -> factory for a fresh controller per game
+POLICIES = {
+    'autopilot': breakout.Autopilot,
+    'follow': lambda: breakout.follow_policy,
+}
+
+# ========================== Games ==========================
+def init_worker():
+    # Only warnings from the workers; the summary is the output
+    breakout.configure_logging(logging.WARNING)
+
+def play_game(seed, policy='autopilot', max_ticks=MAX_TICKS, options=None):
+    """Play one seeded headless game until it ends (or max_ticks) and return its summary."""
+    game = breakout.Game(headless=True, high_score_file=None, seed=seed, **(options or {}))
+    choose = POLICIES[policy]()
+    while not game.game_over and game.ticks < max_ticks:
+        game.step(choose(game))
+    return {
+        'seed': seed,
+        'score': game.score,
+        'win': game.win,
+        'level': game.current_level,
+        'levels_cleared': game.current_level - 1 + game.win,
+        'ticks': game.ticks,
+        'timed_out': not game.game_over,
+        'lives_lost': dict(game.lives_lost),
+        'pickups': dict(game.pickups),
+    }
+
+def play_games(seeds, workers, policy, max_ticks, options):
+    chunksize = max(1, len(seeds) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        return list(pool.map(play_game, seeds, [policy] * len(seeds), [max_ticks] * len(seeds),
+                             [options] * len(seeds), chunksize=chunksize))
+
+# ========================== Summary ==========================
+def summarize(results, elapsed, workers):
+    games = len(results)
+    ticks = sum(result['ticks'] for result in results)
+    print(f"{games} games, {ticks} ticks in {elapsed:.1f}s on {workers} workers: "
+          f"{games / elapsed:.1f} games/s, {ticks / elapsed:.0f} ticks/s")
+    timed_out = sum(result['timed_out'] for result in results)
+    if timed_out:
+        print(f"{timed_out} of {games} games hit the tick limit before ending")
+
+    print(f"\n{'level':>5} {'reached':>8} {'cleared':>8} {'clear rate':>11} {'lives lost/game':>16}")
+    for level in range(1, breakout.max_levels + 1):
+        reached = [result for result in results if result['level'] >= level]
+        if not reached:
+            break
+        cleared = sum(result['levels_cleared'] >= level for result in reached)
+        lost = sum(result['lives_lost'].get(level, 0) for result in reached)
+        print(f"{level:>5} {len(reached):>8} {cleared:>8} {cleared / len(reached):>11.1%} {lost / len(reached):>16.2f}")
+
+    scores = [result['score'] for result in results]
+    print(f"\nscore  mean {statistics.fmean(scores):.0f}  stdev {statistics.pstdev(scores):.0f}  min {min(scores)}  max {max(scores)}")
+    if games > 1:
+        cuts = statistics.quantiles(scores, n=20, method='inclusive')
+        print("      " + "  ".join(f"p{percent} {cuts[percent // 5 - 1]:.0f}" for percent in (10, 25, 50, 75, 90)))
+
+    pickups = Counter()
+    for result in results:
+        pickups.update(result['pickups'])
+    total = sum(pickups.values())
+    print(f"\n{'power-up':<15} {'pickups':>8} {'per game':>9} {'share':>7}")
+    for power_type in breakout.POWERUP_TYPES:
+        count = pickups[power_type]
+        print(f"{power_type:<15} {count:>8} {count / games:>9.2f} {count / total if total else 0:>7.1%}")
+
+# ========================== Entry Point ==========================
+def main():
+    parser = argparse.ArgumentParser(description="Play many seeded headless Breakout games across all cores.")
+    parser.add_argument('--games', type=int, default=1000, help="Number of games to play.")
+    parser.add_argument('--seed', type=int, default=0, help="Games use seeds seed, seed + 1, ...")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='autopilot', help="Scripted paddle policy.")
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS, help="Ticks after which a game is called off.")
+    parser.add_argument('--explosive-bricks', action='store_true', help="Play with explosive bricks.")
+    parser.add_argument('--json', metavar='PATH', help="Also write every game's summary to PATH.")
+    args = parser.parse_args()
+
+    init_worker()
+    options = dict(use_brick_field=True, explosive_bricks=args.explosive_bricks)
+    seeds = list(range(args.seed, args.seed + args.games))
+    start = time.perf_counter()
+    results = play_games(seeds, args.workers, args.policy, args.max_ticks, options)
+    summarize(results, time.perf_counter() - start, args.workers)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1004 @@
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pygame
+
+import breakout017 as breakout
+
+# ========================== Benchmarks ==========================
+def run_ticks(game, ticks, surface=None):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.step(breakout.follow_policy(game))
+        if game.game_over:
+            game.reset()
+        if surface is not None:
+            pygame.event.pump()
+            breakout.draw_frame(game, surface)
+            pygame.display.flip()
+    return time.perf_counter() - start
+
+def bench_headless(ticks, seed):
+    game = breakout.Game(headless=True, high_score_file=None, seed=seed)
+    return run_ticks(game, ticks)
+
+def use_dummy_display():
+    # Fall back to SDL's offscreen driver on display-less machines
+    if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+def bench_display(ticks, seed):
+    use_dummy_display()
+    screen = breakout.init_display()
+    breakout.init_audio()
+    game = breakout.Game(high_score_file=None, seed=seed)
+    try:
+        return run_ticks(game, ticks, screen)
+    finally:
+        pygame.quit()
+
+def bench_grid(iterations, seed, n_balls=10, rows=11, cols=10):
+    """Time brick lookups for n_balls over a full board: linear scan vs BrickGrid."""
+    rng = random.Random(seed)
+    game = breakout.Game(headless=True, high_score_file=None, seed=seed)
+    game.create_bricks(rows, cols)
+    bottom = max(brick.rect.bottom for brick in game.bricks)
+    balls = [breakout.Ball(game, rng.uniform(0, breakout.SCREEN_WIDTH), rng.uniform(40, bottom + 20))
+             for _ in range(n_balls)]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for ball in balls:
+            pygame.sprite.spritecollide(ball, game.bricks, False)
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for ball in balls:
+            game.brick_grid.collide(ball.rect)
+    grid = time.perf_counter() - start
+
+    # Both lookups must agree on every ball
+    for ball in balls:
+        assert pygame.sprite.spritecollide(ball, game.bricks, False) == game.brick_grid.collide(ball.rect)
+
+    queries = iterations * n_balls
+    print(f"{n_balls} balls over {len(game.bricks)} bricks, {queries} queries")
+    print(f"linear     {linear / queries * 1e6:8.2f} us/query")
+    print(f"grid       {grid / queries * 1e6:8.2f} us/query")
+    print(f"grid speedup: {linear / grid:.1f}x")
+
+def build_sprite_board(game, rows, cols):
+    cell_width = breakout.BRICK_WIDTH + breakout.BRICK_PADDING
+    cell_height = breakout.BRICK_HEIGHT + breakout.BRICK_PADDING
+    game.brick_grid = breakout.BrickGrid(rows, cols)
+    for row in range(rows):
+        for col in range(cols):
+            brick = breakout.Brick(game, col * cell_width, row * cell_height)
+            game.bricks.add(brick)
+            game.brick_grid.add(brick, row, col)
+
+def bench_field(iterations, seed, boards=((11, 10), (40, 50), (100, 50))):
+    """Compare Brick sprites with a BrickField on boards of increasing size."""
+    print(f"{'store':<8} {'bricks':>7} {'build ms':>10} {'draw ms':>10} {'collide us':>11} {'left us':>9}")
+    for rows, cols in boards:
+        surface = pygame.Surface((cols * (breakout.BRICK_WIDTH + breakout.BRICK_PADDING),
+                                  rows * (breakout.BRICK_HEIGHT + breakout.BRICK_PADDING)))
+        rng = random.Random(seed)
+        probes = [pygame.Rect(rng.uniform(0, surface.get_width()), rng.uniform(0, surface.get_height()), 20, 20)
+                  for _ in range(10)]
+        for store in ('sprites', 'field'):
+            game = breakout.Game(high_score_file=None, use_brick_field=store == 'field')
+            start = time.perf_counter()
+            if game.use_brick_field:
+                game.brick_field = breakout.BrickField(game, rows, cols, 0, 0)
+                draw = game.brick_field.draw
+            else:
+                build_sprite_board(game, rows, cols)
+                draw = game.bricks.draw
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                draw(surface)
+            draw_time = (time.perf_counter() - start) / iterations
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for probe in probes:
+                    game.brick_store.collide(probe)
+            collide = (time.perf_counter() - start) / (iterations * len(probes))
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                len(game.brick_store)
+            left = (time.perf_counter() - start) / iterations
+
+            print(f"{store:<8} {rows * cols:>7} {build * 1e3:10.2f} {draw_time * 1e3:10.3f} "
+                  f"{collide * 1e6:11.2f} {left * 1e6:9.3f}")
+
+def bench_lasers(iterations, seed, boards=((11, 10), (40, 50), (100, 50)), n_lasers=30, n_balls=10):
+    """Laser hit tests per tick as the board grows: group collision, lattice rect lookup and column lookup."""
+    print(f"{'store':<8} {'bricks':>7} {'groupcollide us':>16} {'rect us':>8} {'column us':>10} "
+          f"{f'rect x{n_balls} balls us':>18}")
+    for rows, cols in boards:
+        rng = random.Random(seed)
+        for store in ('sprites', 'field'):
+            game = breakout.Game(headless=True, high_score_file=None, use_brick_field=store == 'field')
+            if game.use_brick_field:
+                game.brick_field = breakout.BrickField(game, rows, cols, 0, 0)
+            else:
+                build_sprite_board(game, rows, cols)
+            # Columns shot away from below, and a volley rising just under (or already into) the lowest brick of each
+            depths = [rng.randrange(rows // 2 + 1) for _ in range(cols)]
+            for col, depth in enumerate(depths):
+                for row in range(rows - depth, rows):
+                    game.brick_store.bricks_at([row * cols + col])[0].kill()
+            lasers = pygame.sprite.Group()
+            for _ in range(n_lasers):
+                col = rng.randrange(cols)
+                x = col * (breakout.BRICK_WIDTH + breakout.BRICK_PADDING) + rng.uniform(2, breakout.BRICK_WIDTH - 2)
+                bottom = (rows - depths[col]) * (breakout.BRICK_HEIGHT + breakout.BRICK_PADDING) - breakout.BRICK_PADDING
+                lasers.add(breakout.Laser(x, bottom + rng.uniform(10, 40)))
+            timings = {}
+            checks = {
+                'groupcollide': lambda: pygame.sprite.groupcollide(lasers, game.bricks, False, False),
+                'rect': lambda: [game.brick_store.collide(laser.rect) for laser in lasers],
+                'column': lambda: game.brick_store.laser_hits([(laser.rect, -laser.speed_y) for laser in lasers]),
+            }
+            for name, check in checks.items():
+                if name == 'groupcollide' and store == 'field':
+                    continue  # A BrickField has no sprites to collide with
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    check()
+                timings[name] = (time.perf_counter() - start) / iterations * 1e6
+            group = f"{timings['groupcollide']:16.1f}" if 'groupcollide' in timings else f"{'-':>16}"
+            print(f"{store:<8} {rows * cols:>7} {group} {timings['rect']:8.1f} {timings['column']:10.1f} "
+                  f"{timings['rect'] * n_balls:18.1f}")
+
+def bench_blast(iterations, seed, boards=((11, 10), (100, 50)), detonations=(1, 4, 16)):
+    """Compare the per-brick math.hypot blast scan with the lattice's windowed scan and stencil queries."""
+    radius = breakout.BLAST_RADIUS
+    print(f"{'bricks':>7} {'blasts':>7} {'hypot us':>10} {'window us':>10} {'stencil us':>11} {'speedup':>8}")
+    for rows, cols in boards:
+        game = breakout.Game(headless=True, high_score_file=None, use_brick_field=True)
+        game.brick_field = breakout.BrickField(game, rows, cols, 0, 0)
+        field = game.brick_field
+        width = cols * field.cell_width
+        height = rows * field.cell_height
+        live = field.bricks_at(range(rows * cols))
+        rects = [brick.rect for brick in live]
+        for count in detonations:
+            rng = random.Random(seed)
+            xs = [rng.randrange(width) for _ in range(count)]
+            ys = [rng.randrange(height) for _ in range(count)]
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for x, y in zip(xs, ys):
+                    [rect for rect in rects if math.hypot(rect.centerx - x, rect.centery - y) <= radius]
+            scan = (time.perf_counter() - start) / iterations
+
+            timings = {}
+            for name, query in (('window', field.blast_scan_indices), ('stencil', field.blast_stencil_indices)):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    query(xs, ys, radius)
+                timings[name] = (time.perf_counter() - start) / iterations
+            # blast_indices() picks the window below BLAST_SCAN_MAX_DETONATIONS
+            chosen = timings['window' if count <= breakout.BLAST_SCAN_MAX_DETONATIONS else 'stencil']
+            print(f"{rows * cols:>7} {count:>7} {scan * 1e6:10.1f} {timings['window'] * 1e6:10.1f} "
+                  f"{timings['stencil'] * 1e6:11.1f} {scan / chosen:7.1f}x")
+
+def tunneling_trial(swept, speed, target, rng):
+    """Fire one ball at a lone brick or the paddle; returns (should_hit, did_hit)."""
+    game = breakout.Game(headless=True, high_score_file=None, swept_collisions=swept)
+    game.level_start = False
+    # A lone brick at the top; it also keeps the level from counting as cleared
+    game.create_bricks(1, 1)
+    if target == 'brick':
+        rect = game.brick_store.bricks_at([0])[0].rect
+        direction = -1
+    else:
+        rect = game.paddle.rect
+        direction = 1
+    size = 20
+    angle = math.radians(rng.uniform(-40, 40))
+    speed_x = speed * math.sin(angle)
+    speed_y = speed * math.cos(angle) * direction
+    distance = rng.uniform(100, 200)
+    start_y = rect.bottom + distance if direction < 0 else rect.top - size - distance
+    cross_x = rng.uniform(rect.left - size - 10, rect.right + 10)
+    start_x = cross_x - speed_x / abs(speed_y) * abs(rect.centery - (start_y + size / 2))
+
+    travel = (distance + rect.height + size * 2) / abs(speed_y)
+    impact = breakout.sweep_rect(start_x, start_y, size, size, speed_x * travel, speed_y * travel, rect)
+    # The paddle only ever bounces balls that land on its top face
+    should_hit = impact is not None and (target == 'brick' or impact[1] == 'y')
+
+    ball = breakout.Ball(game, start_x + size / 2, start_y + size / 2, speed_x=speed_x, speed_y=speed_y)
+    ball.x, ball.y = start_x, start_y
+    ball.speed_multiplier = speed / breakout.BALL_SPEED
+    ball.normalize_speed()
+    game.balls.add(ball)
+    game.all_sprites.add(ball)
+    for _ in range(int(travel) + 2):
+        game.step()
+        if target == 'brick':
+            if game.score > 0:
+                return should_hit, True
+            if ball.y + size <= rect.top or ball.speed_y > 0:
+                break
+        else:
+            if ball.speed_y < 0:
+                return should_hit, True
+            if ball.y >= rect.bottom:
+                break
+    return should_hit, False
+
+def bench_tunneling(trials, seed, speeds=(6, 15, 25, 40, 60)):
+    """Tunneling rate (missed hits / real hits) of discrete vs swept collisions."""
+    print(f"{'target':<7} {'speed':>6} {'discrete':>9} {'swept':>9}")
+    for target in ('brick', 'paddle'):
+        for speed in speeds:
+            rates = []
+            for swept in (False, True):
+                rng = random.Random(seed)
+                should = missed = 0
+                for _ in range(trials):
+                    should_hit, did_hit = tunneling_trial(swept, speed, target, rng)
+                    should += should_hit
+                    missed += should_hit and not did_hit
+                rates.append(missed / max(should, 1))
+            print(f"{target:<7} {speed:>6} {rates[0]:9.1%} {rates[1]:9.1%}")
+
+def bench_balls(ticks, seed, counts=(10, 100, 500, 5000), max_sprite_balls=500):
+    """Multi-ball stress: ms per tick with Ball sprites vs a BallBatch, on a board that never clears."""
+    print(f"{'balls':>6} {'left':>6} {'sprites ms':>11} {'batch ms':>9} {'speedup':>8}")
+    for count in counts:
+        times = []
+        for batched in (False, True):
+            if not batched and count > max_sprite_balls:
+                times.append(None)  # Each ball re-runs the whole lost-ball scan, so this is quadratic
+                continue
+            rng = random.Random(seed)
+            game = breakout.Game(headless=True, high_score_file=None, use_brick_field=True,
+                                 batched_balls=batched, max_balls=count * 2, seed=seed)
+            game.level_start = False
+            game.brick_field = breakout.BrickField(game, 11, 10, 75, 60, hits=30000)
+            for _ in range(count):
+                angle = rng.uniform(-math.pi * 0.9, -math.pi * 0.1)
+                game.add_ball(rng.uniform(20, breakout.SCREEN_WIDTH - 20), rng.uniform(400, 500),
+                              speed_x=math.cos(angle), speed_y=math.sin(angle))
+            start = time.perf_counter()
+            for _ in range(ticks):
+                game.step()
+            times.append((time.perf_counter() - start) / ticks)
+            left = len(game.balls)
+        sprites, batch = times
+        if sprites is None:
+            print(f"{count:>6} {left:>6} {'-':>11} {batch * 1e3:9.3f} {'-':>8}")
+        else:
+            print(f"{count:>6} {left:>6} {sprites * 1e3:11.3f} {batch * 1e3:9.3f} {sprites / batch:7.1f}x")
+
+LOG_PIPE_READER = "import shutil, sys; shutil.copyfileobj(sys.stdin, open(sys.argv[1], 'w'))"
+
+def logging_storm(game, tick):
+    """Ten balls and a laser every other tick: the most log records a tick of play produces."""
+    scenario_multi_ball(game, tick)
+    return scenario_lasers(game, tick)
+
+def bench_logging(ticks, seed, queue_size=breakout.LOG_QUEUE_SIZE):
+    """Game-thread cost of logging: off, synchronous DEBUG and threaded DEBUG, into a file and a pipe."""
+    records = []
+
+    def count(record):
+        records.append(1)
+        return True
+
+    def play(game, policy):
+        start = time.perf_counter()
+        for tick in range(ticks):
+            game.step(policy(game, tick))
+            if game.game_over:
+                game.reset()
+                start_board(game)
+        return time.perf_counter() - start
+
+    print(f"{'scenario':<8} {'sink':<5} {'logging':<9} {'rec/tick':>9} {'us/tick':>8} {'overhead':>9} "
+          f"{'dropped':>8} {'drain ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for scenario, policy in (('normal', lambda game, tick: breakout.follow_policy(game)),
+                                 ('storm', logging_storm)):
+            for sink in ('file', 'pipe'):
+                base = None
+                for mode in ('off', 'sync', 'threaded'):
+                    path = os.path.join(directory, f"{scenario}-{sink}-{mode}.log")
+                    if sink == 'file':
+                        reader = None
+                        stream = open(path, 'w')
+                    else:
+                        # Another process drains the pipe, as a terminal or `| tee` would
+                        reader = subprocess.Popen([sys.executable, '-c', LOG_PIPE_READER, path],
+                                                  stdin=subprocess.PIPE, text=True)
+                        stream = reader.stdin
+                    level = logging.WARNING if mode == 'off' else logging.DEBUG
+                    handler = breakout.configure_logging(level, threaded=mode == 'threaded', queue_size=queue_size,
+                                                         stream=stream)
+                    logging.getLogger().addFilter(count)
+                    records.clear()
+                    game = breakout.Game(headless=True, high_score_file=None, seed=seed)
+                    start_board(game)
+                    per_tick = play(game, policy) / ticks
+                    start = time.perf_counter()
+                    breakout.stop_logging()  # Waits for the listener to write out its backlog
+                    drain = time.perf_counter() - start
+                    logging.getLogger().removeFilter(count)
+                    breakout.configure_logging(logging.WARNING)
+                    stream.close()
+                    if reader is not None:
+                        reader.wait()
+                    base = base or per_tick
+                    dropped = handler.dropped if handler else 0
+                    print(f"{scenario:<8} {sink:<5} {mode:<9} {len(records) / ticks:9.2f} {per_tick * 1e6:8.1f} "
+                          f"{(per_tick - base) / base:9.0%} {dropped:>8} {drain * 1e3:9.1f}")
+
+def bench_render(frames, seed, level=5):
+    """Full redraw + flip vs DirtyRenderer + display.update(rects) on a full 10-row board."""
+    use_dummy_display()
+    screen = breakout.init_display()
+    print(f"{'renderer':<9} {'frame ms':>9} {'cpu ms':>8} {'dirty area':>11}")
+    try:
+        results = {}
+        for mode in ('full', 'dirty'):
+            game = breakout.Game(high_score_file=None, seed=seed)
+            game.current_level = level  # 5 + level rows
+            game.step(breakout.Inputs(space=True))
+            renderer = breakout.DirtyRenderer(screen)
+            wall = cpu = area = 0.0
+            for _ in range(frames):
+                game.step(breakout.follow_policy(game))
+                if game.game_over:
+                    game.reset()
+                pygame.event.pump()
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                if mode == 'full':
+                    breakout.draw_frame(game, screen)
+                    pygame.display.flip()
+                    area += 1.0
+                else:
+                    rects = renderer.draw(game)
+                    pygame.display.update(rects)
+                    area += sum(rect.w * rect.h for rect in rects) / (breakout.SCREEN_WIDTH * breakout.SCREEN_HEIGHT)
+                wall += time.perf_counter() - start_wall
+                cpu += time.process_time() - start_cpu
+            results[mode] = wall
+            print(f"{mode:<9} {wall / frames * 1e3:9.3f} {cpu / frames * 1e3:8.3f} {area / frames:11.1%}")
+        print(f"dirty speedup: {results['full'] / results['dirty']:.1f}x")
+    finally:
+        pygame.quit()
+
+def draw_hud_uncached(game, surface):
+    """The HUD as draw_frame() used to draw it, with a font.render() per string per frame."""
+    font = breakout.font
+    surface.blit(font.render(f"Score: {game.score}", True, breakout.WHITE), (10, 10))
+    surface.blit(font.render(f"Lives: {game.lives}", True, breakout.WHITE), (breakout.SCREEN_WIDTH - 150, 10))
+    surface.blit(font.render(f"Level: {game.current_level}", True, breakout.WHITE), (10, 40))
+    surface.blit(font.render(f"High Score: {game.high_score}", True, breakout.WHITE), (breakout.SCREEN_WIDTH - 200, 40))
+    surface.blit(font.render(f"Volume: {int(breakout.VOLUME * 100)}%", True, breakout.WHITE), (10, 70))
+    if game.paused:
+        breakout.draw_text("PAUSED", breakout.large_font, breakout.WHITE, surface,
+                           breakout.SCREEN_WIDTH / 2, breakout.SCREEN_HEIGHT / 2)
+
+def draw_hud_cached(game, surface):
+    hud = breakout.hud
+    surface.blit(hud.readout("Score: ", game.score), (10, 10))
+    surface.blit(hud.readout("Lives: ", game.lives), (breakout.SCREEN_WIDTH - 150, 10))
+    surface.blit(hud.readout("Level: ", game.current_level), (10, 40))
+    surface.blit(hud.readout("High Score: ", game.high_score), (breakout.SCREEN_WIDTH - 200, 40))
+    surface.blit(hud.readout("Volume: ", int(breakout.VOLUME * 100), suffix="%"), (10, 70))
+    if game.paused:
+        hud.draw_text("PAUSED", breakout.large_font, breakout.WHITE, surface,
+                      breakout.SCREEN_WIDTH / 2, breakout.SCREEN_HEIGHT / 2)
+
+def bench_hud(frames, seed):
+    """Per-frame HUD cost: font.render every frame vs the cached Hud, plus the whole draw_frame()."""
+    use_dummy_display()
+    screen = breakout.init_display()
+    breakout.init_fonts()
+    try:
+        for scenario in ('steady', 'score churn'):
+            game = breakout.Game(high_score_file=None, seed=seed)
+            game.current_level = 5
+            game.step(breakout.Inputs(space=True))
+            timings = {'uncached': 0.0, 'cached': 0.0, 'frame': 0.0}
+            for frame in range(frames):
+                game.step(breakout.follow_policy(game))
+                if scenario == 'score churn':
+                    game.score += 1  # Worst case: the score changes every frame
+                if game.game_over:
+                    game.reset()
+                for name, draw in (('uncached', draw_hud_uncached), ('cached', draw_hud_cached),
+                                   ('frame', breakout.draw_frame)):
+                    start = time.perf_counter()
+                    draw(game, screen)
+                    timings[name] += time.perf_counter() - start
+            uncached, cached, frame = (timings[name] / frames for name in ('uncached', 'cached', 'frame'))
+            print(f"{scenario:<12} HUD {uncached * 1e3:.3f} -> {cached * 1e3:.3f} ms/frame ({uncached / cached:.1f}x)   "
+                  f"draw_frame {(frame - cached + uncached) * 1e3:.3f} -> {frame * 1e3:.3f} ms/frame")
+    finally:
+        pygame.quit()
+
+def draw_frame_per_blit(game, surface, alpha=1.0):
+    """draw_frame() without the render queue: one Surface.blit() call per sprite and HUD readout."""
+    if not game.advanced:
+        alpha = 1.0
+    breakout.change_background(surface, game.current_level)
+    for brick in game.bricks:
+        surface.blit(brick.image, brick.rect)
+    for sprite in game.all_sprites:
+        if sprite not in game.bricks:
+            surface.blit(sprite.image, game.render_position(sprite, alpha))
+    for message in game.messages:
+        surface.blit(message.image, game.render_position(message, alpha))
+    surface.blit(game.paddle.image, game.render_position(game.paddle, alpha))
+    hud = breakout.hud
+    surface.blit(hud.readout("Score: ", game.score), (10, 10))
+    surface.blit(hud.readout("Lives: ", game.lives), (breakout.SCREEN_WIDTH - 150, 10))
+    surface.blit(hud.readout("Level: ", game.current_level), (10, 40))
+    surface.blit(hud.readout("High Score: ", game.high_score), (breakout.SCREEN_WIDTH - 200, 40))
+    surface.blit(hud.readout("Volume: ", int(breakout.VOLUME * 100), suffix="%"), (10, 70))
+
+def bench_queue(frames, seed, rows=11, cols=10, n_balls=10):
+    """Per-frame draw cost on a rows x cols board with n_balls: a blit per sprite vs the RenderQueue."""
+    use_dummy_display()
+    screen = breakout.init_display()
+    breakout.init_fonts()
+    print(f"{'draw':<10} {'frame ms':>9} {'blit calls':>11}")
+    try:
+        game = breakout.Game(high_score_file=None, seed=seed, max_balls=n_balls)
+        start_board(game, rows=rows, cols=cols)
+        for index in range(1, n_balls):
+            game.add_ball(80 + index * 70, 450)
+        calls = len(game.all_sprites) + len(game.messages) + 6
+        results = {}
+        for mode, draw in (('per blit', draw_frame_per_blit), ('queue', breakout.draw_frame)):
+            pygame.event.pump()
+            draw(game, screen)
+            start = time.perf_counter()
+            for _ in range(frames):
+                draw(game, screen)
+            results[mode] = (time.perf_counter() - start) / frames
+            print(f"{mode:<10} {results[mode] * 1e3:9.3f} {calls if mode == 'per blit' else 1:>11}")
+        # The background fill is the same in both and sets the floor
+        start = time.perf_counter()
+        for _ in range(frames):
+            breakout.change_background(screen, game.current_level)
+        fill = (time.perf_counter() - start) / frames
+        print(f"{'fill only':<10} {fill * 1e3:9.3f} {0:>11}")
+        print(f"{len(game.bricks)} bricks, {len(game.balls)} balls: queue speedup {results['per blit'] / results['queue']:.2f}x, "
+              f"{(results['per blit'] - fill) / (results['queue'] - fill):.2f}x excluding the fill")
+    finally:
+        pygame.quit()
+
+def bench_captions(messages, seed):
+    """Cost of showing a power-up message: SysFont + render + convert_alpha per message vs the caption atlas."""
+    use_dummy_display()
+    breakout.init_display()
+    breakout.init_fonts()
+    rng = random.Random(seed)
+    texts = [rng.choice(list(breakout.POWERUP_CAPTIONS.values())) for _ in range(messages)]
+    print(f"{'captions':<9} {'us/message':>11}")
+    try:
+        game = breakout.Game(high_score_file=None, seed=seed)
+        start = time.perf_counter()
+        for text in texts:
+            pygame.font.SysFont("Arial", 24).render(text, True, breakout.WHITE).convert_alpha()
+        per_message = (time.perf_counter() - start) / messages
+        print(f"{'render':<9} {per_message * 1e6:11.1f}")
+        start = time.perf_counter()
+        breakout.prerender_captions()
+        print(f"{'prerender':<9} {(time.perf_counter() - start) * 1e6:11.1f}  (once, all captions)")
+        start = time.perf_counter()
+        for text in texts:
+            breakout.PowerUpMessage(game, text).kill()
+        atlas = (time.perf_counter() - start) / messages
+        print(f"{'atlas':<9} {atlas * 1e6:11.1f}  (whole PowerUpMessage)")
+    finally:
+        pygame.quit()
+
+class PerSpriteExplosion(pygame.sprite.Sprite):
+    """Explosion as it used to be: its own 2 * max_radius SRCALPHA surface, redrawn every update()."""
+
+    def __init__(self, game, x, y, max_radius=100, color=breakout.EXPLOSION_COLOR, duration=0.5):
+        super().__init__()
+        self.max_radius = max_radius
+        self.current_radius = 10
+        self.color = color
+        self.duration = game.seconds_to_ticks(duration)
+        self.frame = 0
+        self.image = pygame.Surface((max_radius * 2, max_radius * 2), pygame.SRCALPHA)
+        self.rect = self.image.get_rect(center=(x, y))
+        game.all_sprites.add(self)
+
+    def update(self):
+        if self.frame < self.duration:
+            growth_rate = (self.max_radius - self.current_radius) / (self.duration - self.frame)
+            self.current_radius += growth_rate
+            self.image.fill((0, 0, 0, 0))
+            alpha = max(min(255 - int((255 / self.duration) * self.frame), 255), 0)
+            pygame.draw.circle(self.image, self.color + (alpha,), (self.max_radius, self.max_radius), int(self.current_radius))
+            self.frame += 1
+        else:
+            self.kill()
+
+def bench_explosions(frames, seed, concurrent=20):
+    """Update + draw cost of concurrent explosions: per-sprite redraws vs the shared frame atlas."""
+    use_dummy_display()
+    screen = breakout.init_display()
+    rng = random.Random(seed)
+    print(f"{'explosions':<10} {'update ms':>10} {'draw ms':>8} {'frame ms':>9}")
+    try:
+        results = {}
+        for mode, make in (('sprite', PerSpriteExplosion), ('atlas', breakout.Explosion)):
+            game = breakout.Game(high_score_file=None, seed=seed)
+            group = pygame.sprite.Group()
+            update = draw = 0.0
+            for frame in range(frames):
+                while len(group) < concurrent:
+                    explosion = make(game, rng.randrange(breakout.SCREEN_WIDTH), rng.randrange(breakout.SCREEN_HEIGHT))
+                    explosion.frame = rng.randrange(explosion.duration)  # Staggered, as in a chain reaction
+                    group.add(explosion)
+                pygame.event.pump()
+                screen.fill(breakout.BLACK)
+                start = time.perf_counter()
+                group.update()
+                middle = time.perf_counter()
+                screen.blits([(sprite.image, sprite.rect) for sprite in group], doreturn=False)
+                update += middle - start
+                draw += time.perf_counter() - middle
+            results[mode] = update + draw
+            print(f"{mode:<10} {update / frames * 1e3:10.3f} {draw / frames * 1e3:8.3f} {(update + draw) / frames * 1e3:9.3f}")
+        print(f"atlas speedup: {results['sprite'] / results['atlas']:.1f}x with {concurrent} explosions live")
+    finally:
+        pygame.quit()
+
+def bench_replay(path, ticks, seed):
+    """Replay a recording headless (or record a scripted game to path first) and report ticks/s."""
+    if not os.path.exists(path):
+        game = breakout.Game(headless=True, high_score_file=None, seed=seed)
+        game.start_recording()
+        run_ticks(game, ticks)
+        game.recording.save(path)
+        print(f"recorded {ticks} scripted ticks to {path}")
+    recording = breakout.Recording.load(path)
+    start = time.perf_counter()
+    game = recording.replay()
+    elapsed = time.perf_counter() - start
+    report('replay', len(recording), elapsed)
+    print(f"final state: score {game.score}, lives {game.lives}, level {game.current_level}, ticks {game.ticks}")
+
+def bench_env(steps, seed, num_envs=256):
+    """VectorEnv over num_envs games vs the same games each stepped and drawn like a window of their own."""
+    rng = np.random.default_rng(seed)
+    env = breakout.VectorEnv(num_envs, seed=seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(rng.integers(len(breakout.ENV_ACTIONS), size=num_envs))
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.observe()
+    observe = time.perf_counter() - start
+    report(f"env x{num_envs}", steps * num_envs, elapsed)
+    print(f"observations: {observe / elapsed:.0%} of step time")
+
+    use_dummy_display()
+    screen = breakout.init_display()
+    try:
+        games = [breakout.Game(high_score_file=None, seed=seed + i) for i in range(num_envs)]
+        window_steps = max(steps // 10, 1)
+        start = time.perf_counter()
+        for _ in range(window_steps):
+            for game in games:
+                game.step(breakout.follow_policy(game))
+                breakout.draw_frame(game, screen)
+                pygame.display.flip()
+        windows = time.perf_counter() - start
+    finally:
+        pygame.quit()
+    report(f"windows x{num_envs}", window_steps * num_envs, windows)
+    print(f"vector env speedup: {(windows / window_steps) / (elapsed / steps):.1f}x")
+
+def bench_autopilot(ticks, seed, games=5):
+    """follow_policy vs the analytic Autopilot: decision cost, lives lost and levels cleared."""
+    print(f"{'policy':<10} {'us/decision':>12} {'lives lost':>11} {'levels cleared':>15}")
+    for name, make in (('follow', lambda: breakout.follow_policy), ('autopilot', breakout.Autopilot)):
+        decide = lost = cleared = decisions = 0
+        for game_seed in range(seed, seed + games):
+            game = breakout.Game(headless=True, high_score_file=None, seed=game_seed, use_brick_field=True)
+            policy = make()
+            while not game.game_over and game.ticks < ticks:
+                start = time.perf_counter()
+                inputs = policy(game)
+                decide += time.perf_counter() - start
+                game.step(inputs)
+            decisions += game.ticks
+            lost += sum(game.lives_lost.values())
+            cleared += game.current_level - 1 + game.win
+        print(f"{name:<10} {decide / decisions * 1e6:12.2f} {lost:>11} {cleared:>10} of {games * breakout.max_levels}")
+
+SOUND_STARTUP_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+import breakout017 as breakout
+imported = time.perf_counter()
+breakout.configure_logging(breakout.logging.WARNING)
+breakout.SOUND_CACHE_DIR = sys.argv[1]
+breakout.init_audio()
+mixer = time.perf_counter()
+if sys.argv[2] == 'numpy':
+    # How init_audio() used to build every sound up front
+    import numpy as np, pygame
+    for name, frequency in breakout.SOUND_FREQUENCIES.items():
+        duration, volume = breakout.SOUND_SHAPES.get(name, breakout.SOUND_DEFAULT_SHAPE)
+        t = np.linspace(0, duration, int(44100 * duration), False)
+        wave = (np.sin(2 * breakout.math.pi * frequency * t) * volume * 32767).astype(np.int16)
+        breakout.SOUND_EFFECTS[name] = pygame.sndarray.make_sound(np.column_stack((wave, wave)))
+else:
+    for name in breakout.SOUND_FREQUENCIES:
+        breakout.SOUND_EFFECTS[name] = breakout.load_sound(name)
+print(json.dumps({'import': imported - start, 'mixer': mixer - imported, 'sounds': time.perf_counter() - mixer}))
+"""
+
+def bench_sound(runs=5):
+    """Audio startup in fresh processes: NumPy synthesis up front vs the sound cache, cold and warm."""
+    env = dict(os.environ, SDL_AUDIODRIVER=os.environ.get('SDL_AUDIODRIVER', 'dummy'), PYGAME_HIDE_SUPPORT_PROMPT='1')
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'start':<12} {'import ms':>10} {'mixer ms':>9} {'sounds ms':>10}")
+    for mode in ('numpy', 'cold', 'warm'):
+        timings = []
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as cache:
+                if mode == 'warm':
+                    subprocess.run([sys.executable, '-c', SOUND_STARTUP_SCRIPT, cache, 'cache'], cwd=here, env=env,
+                                   check=True, capture_output=True)
+                result = subprocess.run([sys.executable, '-c', SOUND_STARTUP_SCRIPT, cache, mode], cwd=here, env=env,
+                                        check=True, capture_output=True, text=True)
+                timings.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        medians = {phase: statistics.median(run[phase] for run in timings) * 1e3 for phase in ('import', 'mixer', 'sounds')}
+        print(f"{mode:<12} {medians['import']:>10.1f} {medians['mixer']:>9.1f} {medians['sounds']:>10.2f}")
+
+STARTUP_SCRIPT = """
+import json, sys
+import breakout017 as breakout
+import pygame
+startup = breakout.StartupTimer()
+startup.mark('imports')
+breakout.configure_logging(breakout.logging.WARNING)
+if sys.argv[1] == 'eager':
+    # How main() used to start: every subsystem, the fonts and the mixer before the first frame
+    pygame.init()
+    breakout.screen = pygame.display.set_mode((breakout.SCREEN_WIDTH, breakout.SCREEN_HEIGHT))
+    breakout.init_fonts()
+    breakout.init_audio()
+    startup.mark('display')
+    game = breakout.Game(high_score_file=None, seed=1)
+    startup.mark('game')
+    breakout.draw_frame(game, breakout.screen)
+    pygame.display.flip()
+    startup.mark('first frame')
+else:
+    breakout.init_display()
+    startup.mark('display')
+    game = breakout.Game(high_score_file=None, seed=1)
+    startup.mark('game')
+    breakout.draw_board(game, breakout.screen)
+    pygame.display.flip()
+    startup.mark('first frame')
+    # The first full frame loads the fonts; the mixer waits for the first sound
+    breakout.draw_frame(game, breakout.screen)
+    pygame.display.flip()
+startup.mark('ready')
+print(json.dumps(startup.phases))
+"""
+
+def bench_startup(runs=5):
+    """Startup in fresh processes: everything before the first frame vs main()'s lazy sequence."""
+    use_dummy_display()
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    here = os.path.dirname(os.path.abspath(__file__))
+    phases = ('imports', 'display', 'game', 'first frame', 'ready')
+    print(f"{'start':<7} " + " ".join(f"{phase + ' ms':>14}" for phase in phases) + f" {'to frame ms':>12}")
+    for mode in ('eager', 'lazy'):
+        timings = []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, mode], cwd=here, env=env,
+                                    check=True, capture_output=True, text=True)
+            timings.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        medians = {phase: statistics.median(run.get(phase, 0.0) for run in timings) for phase in phases}
+        # Imports swing by tens of ms between runs; time to the first frame is counted from main()
+        to_frame = statistics.median(sum(run[phase] for phase in phases[1:4]) for run in timings)
+        print(f"{mode:<7} " + " ".join(f"{medians[phase]:>14.2f}" for phase in phases) + f" {to_frame:>12.1f}")
+
+def report(name, ticks, elapsed):
+    print(f"{name:<10} {ticks:>8} ticks  {elapsed:8.3f}s  {ticks / elapsed:12.1f} ticks/s")
+
+# ========================== Scenario Suite ==========================
+SCENARIO_LIVES = 99  # Scripted scenarios should never end on a game over
+REGRESSION_THRESHOLD = 0.15
+# Metric -> (True if a larger value is better, smallest absolute change worth flagging)
+SCENARIO_METRICS = {
+    'ticks_per_s': (True, 0.0),
+    'p50_ms': (False, 0.005),
+    'p95_ms': (False, 0.005),
+    'p99_ms': (False, 0.005),
+    'peak_rss_mb': (False, 1.0),
+}
+TICK_TIME_FLOOR_MS = 0.005  # Ticks/s swings on near-free ticks (a paused game) are timer noise
+SCENARIO_MAX_TICKS = 100000  # Budget for scenarios that run until done, whatever --ticks is
+
+def start_board(game, level=5, rows=11, cols=10):
+    """Start a level on a rows x cols board straight away, as start_level() would."""
+    game.current_level = level
+    game.lives = SCENARIO_LIVES
+    game.level_start = False
+    game.clear_active_powerups()
+    game.create_bricks(rows, cols, level)
+    game.add_ball(breakout.SCREEN_WIDTH / 2, breakout.SCREEN_HEIGHT / 2, speed_increment=0.1 * level)
+    game.paddle.center_paddle()
+
+level_clear_pilot = None
+
+def scenario_level_clear(game, tick):
+    global level_clear_pilot
+    if tick == 0:
+        level_clear_pilot = breakout.Autopilot()  # It caches the board, so start each run with a fresh one
+    if game.level_start or game.game_over:
+        return None  # Board cleared (level 5 is the last, so clearing it wins the game)
+    return level_clear_pilot(game)
+
+def scenario_multi_ball(game, tick):
+    # Top the balls back up to the cap as they are lost
+    while game.balls and not game.level_start and len(game.balls) < game.max_balls:
+        game.apply_powerup('multi_ball')
+    return breakout.follow_policy(game)
+
+def scenario_lasers(game, tick):
+    if not game.level_start and 'laser_paddle' not in game.paddle.active_powerups:
+        game.paddle.activate_powerup('laser_paddle')
+    return breakout.follow_policy(game)._replace(space=tick % 2 == 0)  # A rising edge, and a shot, every other tick
+
+def scenario_explosive(game, tick):
+    # Re-arm as soon as every ball has detonated
+    if game.balls and not game.level_start and not any(ball.explosive for ball in game.balls):
+        game.apply_powerup('explosive_ball')
+    return breakout.follow_policy(game)
+
+def scenario_pause(game, tick):
+    return breakout.Inputs(pause=tick == 0)
+
+# name -> (policy, run until the policy stops rather than for a fixed tick count)
+SCENARIOS = {
+    'level5_clear': (scenario_level_clear, True),
+    'multi_ball_10': (scenario_multi_ball, False),
+    'laser_spam': (scenario_lasers, False),
+    'explosive_ball': (scenario_explosive, False),
+    'idle_pause': (scenario_pause, False),
+}
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10  # Bytes on macOS, KiB elsewhere
+
+def run_scenario(name, mode, ticks, seed, max_ticks):
+    """Run one scenario and time every tick (step, plus draw and flip in display mode)."""
+    breakout.configure_logging(logging.WARNING)
+    policy, until_done = SCENARIOS[name]
+    screen = None
+    if mode == 'display':
+        use_dummy_display()
+        screen = breakout.init_display()
+    game = breakout.Game(headless=screen is None, high_score_file=None, seed=seed)
+    start_board(game)
+    times = []
+    try:
+        for tick in range(max_ticks if until_done else ticks):
+            inputs = policy(game, tick)
+            if inputs is None:
+                break
+            start = time.perf_counter()
+            game.step(inputs)
+            if screen is not None:
+                pygame.event.pump()
+                breakout.draw_frame(game, screen)
+                pygame.display.flip()
+            times.append(time.perf_counter() - start)
+    finally:
+        if screen is not None:
+            pygame.quit()
+    cuts = statistics.quantiles(times, n=100)
+    return {
+        'ticks': len(times),
+        'ticks_per_s': len(times) / sum(times),
+        'p50_ms': cuts[49] * 1e3,
+        'p95_ms': cuts[94] * 1e3,
+        'p99_ms': cuts[98] * 1e3,
+        'peak_rss_mb': peak_rss_mb(),
+        'finished': (game.level_start or game.game_over) if until_done else None,
+    }
+
+def find_regressions(result, baseline, threshold):
+    """Metrics that are more than threshold worse than the baseline, as (metric, baseline, current)."""
+    regressions = []
+    for metric, (higher_is_better, floor) in SCENARIO_METRICS.items():
+        old, new = baseline.get(metric), result.get(metric)
+        if not old or new is None:
+            continue
+        if metric == 'ticks_per_s' and 1e3 / new - 1e3 / old < TICK_TIME_FLOOR_MS:
+            continue
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        if change > threshold and abs(new - old) >= floor:
+            regressions.append((metric, old, new))
+    return regressions
+
+def bench_scenarios(modes, ticks, seed, baseline_path, save_baseline=False, threshold=REGRESSION_THRESHOLD):
+    """Run every scripted scenario in its own process and compare to a baseline; returns the number regressed."""
+    baseline = {}
+    if baseline_path and os.path.exists(baseline_path) and not save_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+    results = {}
+    failed = 0
+    print(f"{'scenario':<15} {'mode':<9} {'ticks':>6} {'ticks/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>7}")
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Once per spawned process is too chatty
+    context = multiprocessing.get_context('spawn')
+    for mode in modes:
+        for name in SCENARIOS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_scenario, name, mode, ticks, seed, SCENARIO_MAX_TICKS).result()
+            key = f"{name}/{mode}"
+            rss = result['peak_rss_mb']
+            note = " (not cleared)" if result['finished'] is False else ""
+            print(f"{name:<15} {mode:<9} {result['ticks']:>6} {result['ticks_per_s']:>9.0f} {result['p50_ms']:>8.3f} "
+                  f"{result['p95_ms']:>8.3f} {result['p99_ms']:>8.3f} {rss if rss is not None else float('nan'):>7.1f}{note}")
+            if result['finished'] is False:
+                failed += 1  # Timings of a run that never got there say nothing about the scenario, so keep them out
+                continue
+            results[key] = result
+            regressions = find_regressions(result, baseline.get(key, {}), threshold)
+            if regressions:
+                failed += 1
+                for metric, old, new in regressions:
+                    print(f"  REGRESSION {metric}: {old:.3f} -> {new:.3f} ({(new - old) / old:+.0%})")
+    if save_baseline and baseline_path:
+        with open(baseline_path, 'w') as f:
+            json.dump({'ticks': ticks, 'seed': seed, 'results': results}, f, indent=2)
+        print(f"saved baseline to {baseline_path}")
+    elif baseline:
+        print(f"{failed} scenario(s) failed or regressed by more than {threshold:.0%} against {baseline_path}")
+    return failed
+
+# ========================== Entry Point ==========================
+def main():
+    parser = argparse.ArgumentParser(description="Breakout engine benchmarks.")
+    parser.add_argument('benchmark', nargs='?', choices=['engine', 'grid', 'field', 'blast', 'tunneling', 'balls', 'logging', 'render', 'hud', 'replay', 'scenarios', 'env', 'autopilot', 'sound', 'startup', 'explosions', 'captions', 'queue', 'lasers'], default='engine',
+                        help="engine: display vs headless ticks/s; grid: brick collision lookups; "
+                             "field: Brick sprites vs BrickField; blast: explosive ball blast queries; "
+                             "lasers: laser hit tests per tick as the board grows; "
+                             "tunneling: discrete vs swept collision miss rate; "
+                             "balls: Ball sprites vs BallBatch multi-ball stress; "
+                             "logging: frame-time cost of synchronous vs threaded logging; "
+                             "render: full redraw vs dirty-rect renderer; "
+                             "hud: per-frame HUD text cost, uncached vs cached; "
+                             "explosions: 20 concurrent explosions, per-sprite redraws vs shared frame atlas; "
+                             "captions: power-up message cost, font lookup and render vs caption atlas; "
+                             "queue: draw cost at 110 bricks and 10 balls, a blit per sprite vs one RenderQueue blits(); "
+                             "replay: headless replay of a recording; "
+                             "scenarios: scripted scenario suite checked against a baseline file; "
+                             "env: VectorEnv of 256 games vs 256 rendered games; "
+                             "autopilot: follow policy vs analytic Autopilot over whole games; "
+                             "sound: audio startup, NumPy synthesis vs cold and warm sound cache; "
+                             "startup: time to the first frame, eager vs lazy subsystem and font loading.")
+    parser.add_argument('--ticks', type=int, default=5000, help="Simulation ticks per run.")
+    parser.add_argument('--seed', type=int, default=1, help="Seed for each benchmark Game's random number generator.")
+    parser.add_argument('--mode', choices=['headless', 'display', 'both'], default='both')
+    parser.add_argument('--recording', default='bench_recording.json',
+                        help="Recording for the replay benchmark; a scripted game is recorded there if it is missing.")
+    parser.add_argument('--baseline', default='bench_baseline.json',
+                        help="Baseline results for the scenario suite; regressions against it are flagged.")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the scenario results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative change in a scenario metric that counts as a regression.")
+    args = parser.parse_args()
+
+    # Game logging goes to stdout at DEBUG; keep it out of the measurement
+    breakout.configure_logging(logging.WARNING)
+
+    if args.benchmark == 'grid':
+        bench_grid(args.ticks, args.seed)
+        return
+    if args.benchmark == 'field':
+        bench_field(max(args.ticks // 50, 1), args.seed)
+        return
+    if args.benchmark == 'lasers':
+        bench_lasers(max(args.ticks // 10, 1), args.seed)
+        return
+    if args.benchmark == 'blast':
+        bench_blast(max(args.ticks // 10, 1), args.seed)
+        return
+    if args.benchmark == 'tunneling':
+        bench_tunneling(max(args.ticks // 10, 1), args.seed)
+        return
+    if args.benchmark == 'balls':
+        bench_balls(max(args.ticks // 50, 1), args.seed)
+        return
+    if args.benchmark == 'logging':
+        bench_logging(args.ticks, args.seed)
+        return
+    if args.benchmark == 'render':
+        bench_render(max(args.ticks // 5, 1), args.seed)
+        return
+    if args.benchmark == 'hud':
+        bench_hud(max(args.ticks // 5, 1), args.seed)
+        return
+    if args.benchmark == 'explosions':
+        bench_explosions(max(args.ticks // 5, 1), args.seed)
+        return
+    if args.benchmark == 'captions':
+        bench_captions(max(args.ticks // 5, 1), args.seed)
+        return
+    if args.benchmark == 'queue':
+        bench_queue(max(args.ticks // 5, 1), args.seed)
+        return
+    if args.benchmark == 'replay':
+        bench_replay(args.recording, args.ticks, args.seed)
+        return
+    if args.benchmark == 'env':
+        bench_env(max(args.ticks // 10, 1), args.seed)
+        return
+    if args.benchmark == 'autopilot':
+        bench_autopilot(args.ticks * 12, args.seed)
+        return
+    if args.benchmark == 'sound':
+        bench_sound()
+        return
+    if args.benchmark == 'startup':
+        bench_startup()
+        return
+    if args.benchmark == 'scenarios':
+        modes = ['headless', 'display'] if args.mode == 'both' else [args.mode]
+        if bench_scenarios(modes, args.ticks, args.seed, args.baseline, args.save_baseline, args.threshold):
+            sys.exit(1)
+        return
+
+    results = {}
+    if args.mode in ('headless', 'both'):
+        results['headless'] = bench_headless(args.ticks, args.seed)
+        report('headless', args.ticks, results['headless'])
+    if args.mode in ('display', 'both'):
+        results['display'] = bench_display(args.ticks, args.seed)
+        report('display', args.ticks, results['display'])
+    if len(results) == 2:
+        print(f"headless speedup: {results['display'] / results['headless']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
+import time
+MODULE_LOAD_STARTED = time.perf_counter()  # Taken before the heavy imports, for the startup report
 import pygame
 import sys
+import argparse
 import random
 import math
 import numpy as np
 import os
 import logging
+import logging.handlers
+import queue
+import atexit
+import functools
+import json
+import array
+import csv
+from collections import Counter, deque, namedtuple
 
 # ========================== Constants ==========================
 # Screen Dimensions
@@ -14,10 +25,19 @@ SCREEN_HEIGHT = 600
 # Frames Per Second
 FPS = 60
 
+# Simulation Clock
+TICK_RATE = 60              # Physics ticks per simulated second
+BASE_TICK_RATE = 60         # Tick rate the per-tick speeds below are tuned for
+MAX_FRAME_TIME = 0.25       # Seconds of simulation a slow frame may catch up on
+INTERPOLATION_SNAP = 50     # Sprites that jump further than this in one tick are drawn without interpolation
+TURBO_LEVELS = (1, 4, 16, 64)  # Ticks per rendered frame the T key cycles through; 1 is real time
+
 # Ball Properties
 BALL_SPEED = 6
+BALL_RADIUS = 10
 MAX_SPEED = 15
 MAX_BALLS = 10
+MAX_BOUNCES_PER_TICK = 4  # Contacts resolved per ball per tick with swept collisions
 
 # Paddle Properties
 PADDLE_WIDTH = 100
@@ -25,7 +45,18 @@ PADDLE_HEIGHT = 20
 PADDLE_SPEED = 7
 EXPANDED_WIDTH = 150
 SHRUNK_WIDTH = 70
-POWERUP_DURATION = 300  # Frames
+POWERUP_DURATION = 5.0  # Seconds
+
+# Brick Properties
+BRICK_WIDTH = 60
+BRICK_HEIGHT = 20
+BRICK_PADDING = 5
+
+# Explosions
+BLAST_RADIUS = 100              # Explosive ball blast radius
+EXPLOSIVE_BRICK_CHANCE = 0.1    # Chance a destroyed brick explodes its neighbours
+EXPLOSION_REACH = 70            # Neighbours closer than this on both axes are destroyed
+MAX_CHAIN_EXPLOSIONS = 20       # Cap on brick explosions set off by a single hit
 
 # Colors
 WHITE = (255, 255, 255)        # Default ball color
@@ -47,6 +78,18 @@ EXPLOSIVE_BALL_COLOR = RED    # Use RED for explosive ball
 POWERUP_TYPES = ['expand_paddle', 'extra_life', 'multi_ball',
                 'shrink_paddle', 'slow_ball', 'laser_paddle', 'explosive_ball']  # Added 'explosive_ball'
 
+# Messages shown when a power-up is caught
+POWERUP_CAPTIONS = {
+    'expand_paddle': "Expanded Paddle!",
+    'extra_life': "Extra Life!",
+    'multi_ball': "Multi-Ball!",
+    'shrink_paddle': "Shrunk Paddle!",
+    'slow_ball': "Slowed Ball!",
+    'laser_paddle': "Laser Paddle!",
+    'explosive_ball': "Explosive Ball!"
+}
+DEFAULT_POWERUP_CAPTION = "Power-Up!"
+
 # High Score File
 HIGH_SCORE_FILE = 'highscore.txt'
 
@@ -60,66 +103,287 @@ SOUND_FREQUENCIES = {
     'powerup': 550,      # C#5
     'laser': 700         # Short laser sound
 }
+SOUND_DEFAULT_SHAPE = (0.1, 0.5)  # (duration, volume) of a sound not in SOUND_SHAPES
+SOUND_SHAPES = {
+    'explosion': (0.2, 0.7),
+    'laser': (0.05, 0.3),
+}
+# Synthesized sounds as raw PCM, keyed by frequency, duration, volume and format; next to this file, not the cwd
+SOUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sound_cache')
+SOUND_VOICE_BUDGET = 6      # Game sounds playing at once (the mixer has 8 channels by default)
+SOUND_MERGE_GAIN = 0.25     # Extra volume for each merged duplicate request in a tick
+SOUND_MERGE_LEVELS = 4      # Merged requests beyond this many get no louder
+# Which sounds win when a tick asks for more voices than are free; lower plays first
+SOUND_PRIORITY = {name: rank for rank, name in enumerate(
+    ['game_over', 'explosion', 'powerup', 'paddle', 'brick', 'laser', 'wall'])}
 
 # Maximum Levels
 max_levels = 5  # Moved to global scope
 
-# ========================== Logging Configuration ==========================
-logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG for detailed logs
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Named tuple describing the held state of the game controls for one tick.
+Inputs = namedtuple('Inputs', ['left', 'right', 'space', 'pause'], defaults=(False, False, False, False))
+NO_INPUT = Inputs()
 
-logging.info("Initializing Pygame and setting up the game.")
+# ========================== Logging Configuration ==========================
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_QUEUE_SIZE = 10000  # Records the threaded log pipeline buffers before dropping
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking the game thread when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0      # Records lost
+        self.overflows = 0    # Times the queue filled up
+        self.overflowing = False
+
+    def prepare(self, record):
+        # The game only logs pre-formatted f-strings, so there are no mutable args to snapshot
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.overflowing = False
+        except queue.Full:
+            self.dropped += 1
+            if not self.overflowing:
+                self.overflowing = True
+                self.overflows += 1
+
+class LogListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room instead of failing when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+log_listener = None
+
+def configure_logging(level=logging.DEBUG, threaded=False, queue_size=LOG_QUEUE_SIZE, stream=None):
+    """Send log records to stream (stdout by default); returns the DroppingQueueHandler if threaded."""
+    global log_listener
+    stop_logging()
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    if not threaded:
+        logging.basicConfig(level=level, format=LOG_FORMAT, handlers=[stream_handler], force=True)
+        return None
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler = DroppingQueueHandler(queue.Queue(queue_size))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
+    log_listener = LogListener(handler.queue, stream_handler)
+    log_listener.start()
+    return handler
+
+def stop_logging():
+    """Flush and stop the threaded log pipeline, reporting any dropped records."""
+    global log_listener
+    if log_listener is None:
+        return
+    root = logging.getLogger()
+    queue_handlers = [handler for handler in root.handlers if isinstance(handler, DroppingQueueHandler)]
+    for handler in queue_handlers:
+        root.removeHandler(handler)
+    log_listener.stop()
+    stream_handler = log_listener.handlers[0]
+    for handler in queue_handlers:
+        if handler.dropped:
+            stream_handler.handle(logging.makeLogRecord({
+                'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': f"Log queue overflowed {handler.overflows} times; {handler.dropped} records dropped."}))
+    log_listener = None
+
+atexit.register(stop_logging)
 
 # ========================== Initialize Pygame ==========================
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Breakout Game")
-clock = pygame.time.Clock()
-
-# Fonts
-font = pygame.font.SysFont("Arial", 24)
-large_font = pygame.font.SysFont("Arial", 48)
-
-# Initialize Mixer
-try:
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-    logging.info("Pygame mixer initialized successfully.")
-except pygame.error as e:
-    logging.error(f"Failed to initialize Pygame mixer: {e}")
+# The window and clock only exist once init_display() has run, and the fonts
+# once init_fonts() has. A headless Game never touches them, so importing this
+# module has no side effects.
+screen = None
+clock = None
+font = None
+large_font = None
+hud = None
+
+def init_display():
+    """Open the window. Only the display subsystem is started; see init_fonts() and init_audio()."""
+    global screen, clock, font, large_font, hud, mixer_tried
+    logging.info("Initializing Pygame and setting up the game.")
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Breakout Game")
+    clock = pygame.time.Clock()
+    # Images made without a window aren't in its pixel format, and fonts and the mixer don't outlive pygame.quit()
+    mixer_tried = False
+    sprite_image.cache_clear()
+    explosion_frames.cache_clear()
+    caption_image.cache_clear()
+    get_font.cache_clear()
+    font = large_font = hud = None
+    return screen
+
+@functools.lru_cache(maxsize=None)
+def get_font(face, size):
+    """The font for (face, size), loaded once per process (the system font lookup is slow)."""
+    pygame.font.init()
+    logging.debug(f"Loading font {face} {size}.")
+    return pygame.font.SysFont(face, size)
+
+def init_fonts():
+    """Load the HUD fonts and power-up captions the first time they're needed."""
+    global font, large_font, hud
+    if hud is not None:
+        return
+    font = get_font("Arial", 24)
+    large_font = get_font("Arial", 48)
+    hud = Hud(font)
+    prerender_captions()
+
+class StartupTimer:
+    """Wall time of each startup phase, from the start of the module import."""
+
+    def __init__(self, started=MODULE_LOAD_STARTED):
+        self.phases = {}
+        self.started = started
+        self.last = started
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last) * 1000
+        self.last = now
+
+    def report(self):
+        total = (self.last - self.started) * 1000
+        logging.info(f"Startup took {total:.1f} ms: " +
+                     ", ".join(f"{phase} {ms:.1f} ms" for phase, ms in self.phases.items()) + ".")
+        return self.phases
 
 # ========================== Sound Management ==========================
-def generate_sound(frequency, duration=0.1, volume=0.5):
-    logging.debug(f"Generating sound: frequency={frequency}Hz, duration={duration}s, volume={volume}.")
-    sample_rate = 44100
+def synthesize_samples(frequency, duration, volume, sample_rate=44100, channels=2):
+    """Signed 16-bit PCM of a sine tone, one copy per channel, using only the standard library."""
     n_samples = int(sample_rate * duration)
-    t = np.linspace(0, duration, n_samples, False)
-    wave = np.sin(2 * math.pi * frequency * t)
-    wave = (wave * volume * 32767).astype(np.int16)
-    stereo_wave = np.column_stack((wave, wave))
-    sound = pygame.sndarray.make_sound(stereo_wave)
-    logging.debug("Sound generated successfully.")
+    omega = 2 * math.pi * frequency
+    step = duration / n_samples
+    mono = array.array('h', [int(math.sin(omega * (i * step)) * volume * 32767) for i in range(n_samples)])
+    samples = array.array('h', bytes(2 * n_samples * channels))
+    for channel in range(channels):
+        samples[channel::channels] = mono
+    return samples.tobytes()
+
+def sound_cache_path(frequency, duration, volume):
+    sample_rate, size, channels = pygame.mixer.get_init()
+    return os.path.join(SOUND_CACHE_DIR, f"{frequency}hz-{duration}s-{volume}v-{sample_rate}x{channels}x{abs(size)}.pcm")
+
+def load_sound(name):
+    """The named sound from SOUND_CACHE_DIR, synthesized and written to the cache on a miss."""
+    duration, volume = SOUND_SHAPES.get(name, SOUND_DEFAULT_SHAPE)
+    frequency = SOUND_FREQUENCIES[name]
+    path = sound_cache_path(frequency, duration, volume)
+    try:
+        with open(path, 'rb') as file:
+            samples = file.read()
+    except OSError:
+        sample_rate, _, channels = pygame.mixer.get_init()
+        samples = synthesize_samples(frequency, duration, volume, sample_rate, channels)
+        try:
+            os.makedirs(SOUND_CACHE_DIR, exist_ok=True)
+            with open(path + '.tmp', 'wb') as file:
+                file.write(samples)
+            os.replace(path + '.tmp', path)  # Never leave a half-written cache entry
+        except OSError as e:
+            logging.warning(f"Could not cache sound '{name}' in {SOUND_CACHE_DIR}: {e}")
+        logging.debug(f"Sound '{name}' synthesized.")
+    sound = pygame.mixer.Sound(buffer=samples)
+    sound.set_volume(VOLUME)
     return sound
 
-# Pre-generate and cache sounds
+# Sounds loaded so far; each is loaded by load_sound() the first time it plays
 SOUND_EFFECTS = {}
-for key, freq in SOUND_FREQUENCIES.items():
-    if key == 'explosion':
-        SOUND_EFFECTS[key] = generate_sound(freq, duration=0.2, volume=0.7)
-    elif key == 'laser':
-        SOUND_EFFECTS[key] = generate_sound(freq, duration=0.05, volume=0.3)
-    else:
-        SOUND_EFFECTS[key] = generate_sound(freq)
-
-# Set initial volume
 VOLUME = 0.1
-for sound in SOUND_EFFECTS.values():
-    sound.set_volume(VOLUME)
-logging.debug(f"Initial volume set to {VOLUME * 100}%.")
+
+mixer_tried = False  # Whether init_audio() has run; a mixer that failed once isn't retried
+
+def init_audio():
+    """Start the mixer the first time a sound plays; returns whether it is running."""
+    global mixer_tried
+    if not mixer_tried:
+        mixer_tried = True
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            logging.info("Pygame mixer initialized successfully.")
+        except pygame.error as e:
+            logging.error(f"Failed to initialize Pygame mixer: {e}")
+    return pygame.mixer.get_init() is not None
+
+def get_sound(name):
+    """The named sound, loaded on first use; None without a mixer."""
+    sound = SOUND_EFFECTS.get(name)
+    if sound is None:
+        if name not in SOUND_FREQUENCIES or not pygame.mixer.get_init():
+            return None
+        sound = SOUND_EFFECTS[name] = load_sound(name)
+    return sound
+
+def play_sound(name):
+    sound = get_sound(name)
+    if sound is not None:
+        sound.play()
+
+class SoundDispatcher:
+    """Plays each tick's sound requests together in flush(), merging repeats and keeping to voice_budget."""
+
+    def __init__(self, voice_budget=SOUND_VOICE_BUDGET):
+        self.voice_budget = voice_budget
+        self.pending = Counter()
+        self.voices = []       # Channels this dispatcher started that may still be playing
+        self.louder = {}       # (name, merged requests) -> louder copy of the sound
+        self.louder_volume = None
+        self.played = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def request(self, name):
+        self.pending[name] += 1
+
+    def flush(self):
+        if not self.pending:
+            return
+        if not init_audio():
+            self.pending.clear()
+            return
+        self.voices = [channel for channel in self.voices if channel.get_busy()]
+        names = sorted(self.pending, key=lambda name: (SOUND_PRIORITY.get(name, len(SOUND_PRIORITY)), -self.pending[name]))
+        free = max(self.voice_budget - len(self.voices), 0)
+        for name in names[free:]:
+            self.dropped += self.pending[name]
+        for name in names[:free]:
+            count = self.pending[name]
+            self.merged += count - 1
+            sound = self.sound(name, min(count, SOUND_MERGE_LEVELS))
+            if sound is None:
+                continue
+            channel = sound.play()
+            if channel is None:
+                self.dropped += count  # The mixer had no free channel
+                continue
+            self.voices.append(channel)
+            self.played += 1
+        self.pending.clear()
+
+    def sound(self, name, level):
+        sound = get_sound(name)
+        if sound is None or level == 1:
+            return sound
+        if self.louder_volume != VOLUME:
+            self.louder.clear()
+            self.louder_volume = VOLUME
+        louder = self.louder.get((name, level))
+        if louder is None:
+            louder = self.louder[(name, level)] = pygame.mixer.Sound(buffer=sound.get_raw())
+            louder.set_volume(min(1.0, VOLUME * (1 + SOUND_MERGE_GAIN * (level - 1))))
+        return louder
+
+    def stats(self):
+        return f"{self.played} played, {self.merged} merged, {self.dropped} dropped"
 
 # ========================== Utility Functions ==========================
 def calculate_angle(speed_x, speed_y):
@@ -153,38 +417,79 @@ def save_high_score(score, filename=HIGH_SCORE_FILE):
     except Exception as e:
         logging.error(f"Failed to save high score: {e}")
 
+def sweep_rect(x, y, width, height, dx, dy, rect):
+    """(time, axis) at which a width x height box at (x, y) moving by (dx, dy) first overlaps rect, or None."""
+    if dx > 0:
+        entry_x, exit_x = (rect.left - x - width) / dx, (rect.right - x) / dx
+    elif dx < 0:
+        entry_x, exit_x = (rect.right - x) / dx, (rect.left - x - width) / dx
+    elif x + width <= rect.left or x >= rect.right:
+        return None
+    else:
+        entry_x, exit_x = -math.inf, math.inf
+    if dy > 0:
+        entry_y, exit_y = (rect.top - y - height) / dy, (rect.bottom - y) / dy
+    elif dy < 0:
+        entry_y, exit_y = (rect.bottom - y) / dy, (rect.top - y - height) / dy
+    elif y + height <= rect.top or y >= rect.bottom:
+        return None
+    else:
+        entry_y, exit_y = -math.inf, math.inf
+
+    entry = max(entry_x, entry_y)
+    if entry >= min(exit_x, exit_y) or entry > 1 or min(exit_x, exit_y) <= 0:
+        return None
+    if entry < 0:
+        overlap_x = min(x + width, rect.right) - max(x, rect.left)
+        overlap_y = min(y + height, rect.bottom) - max(y, rect.top)
+        return 0.0, 'x' if overlap_x < overlap_y else 'y'
+    return entry, 'x' if entry_x > entry_y else 'y'
+
 def draw_text(text, font, color, surface, x, y):
     text_obj = font.render(text, True, color)
     text_rect = text_obj.get_rect(center=(x, y))
-    surface.blit(text_obj, text_rect)
+    return surface.blit(text_obj, text_rect)
 
 # ========================== Game Classes ==========================
+@functools.lru_cache(maxsize=None)
+def sprite_image(kind, size, color):
+    """The image shared by every 'paddle', 'ball', 'powerup' or 'laser' sprite of this size and colour."""
+    if kind == 'ball':
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (size[0] // 2, size[1] // 2), size[0] // 2)
+    else:
+        image = pygame.Surface(size)
+        image.fill(color)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if kind == 'ball' else image.convert()
+    return image
+
 class Paddle(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, game):
         super().__init__()
         logging.debug("Initializing Paddle.")
+        self.game = game
         self.original_width = PADDLE_WIDTH
         self.width = self.original_width
         self.height = PADDLE_HEIGHT
         self.color = BLUE
         self.original_color = BLUE
         self.speed = PADDLE_SPEED
-        self.image = pygame.Surface([self.width, self.height])
-        self.image.fill(self.color)
+        self.image = sprite_image('paddle', (self.width, self.height), self.color)
         self.rect = self.image.get_rect(centerx=SCREEN_WIDTH / 2, bottom=SCREEN_HEIGHT - 30)
         self.active_powerups = {}
         self.moving_left = False
         self.moving_right = False
+        self.subpixel_x = 0.0  # Movement left over when a tick's speed is not a whole pixel
         logging.debug(f"Paddle initialized at position ({self.rect.centerx}, {self.rect.centery}).")
 
-    def update(self, keys):
-        self.moving_left = keys[pygame.K_LEFT]
-        self.moving_right = keys[pygame.K_RIGHT]
+    def update(self, moving_left, moving_right):
+        self.moving_left = moving_left
+        self.moving_right = moving_right
 
-        if self.moving_left:
-            self.rect.x -= self.speed
-        if self.moving_right:
-            self.rect.x += self.speed
+        move = (self.moving_right - self.moving_left) * self.speed * self.game.speed_scale + self.subpixel_x
+        self.subpixel_x = move - int(move)
+        self.rect.x += int(move)
 
         # Keep paddle within screen
         self.rect.left = max(self.rect.left, 0)
@@ -202,23 +507,21 @@ class Paddle(pygame.sprite.Sprite):
 
     def activate_powerup(self, power_type, duration=POWERUP_DURATION):
         logging.info(f"Activating power-up: {power_type}.")
-        self.active_powerups[power_type] = duration
+        self.active_powerups[power_type] = self.game.seconds_to_ticks(duration)
         if power_type == 'expand_paddle':
             self.width = min(EXPANDED_WIDTH, SCREEN_WIDTH - 20)
-            self.image = pygame.Surface([self.width, self.height])
-            self.image.fill(ORANGE)
+            self.image = sprite_image('paddle', (self.width, self.height), ORANGE)
             self.rect = self.image.get_rect(center=self.rect.center)
             logging.debug(f"Paddle expanded to width {self.width}.")
         elif power_type == 'shrink_paddle':
             self.width = max(SHRUNK_WIDTH, 50)
-            self.image = pygame.Surface([self.width, self.height])
-            self.image.fill(SHRINK_COLOR)
+            self.image = sprite_image('paddle', (self.width, self.height), SHRINK_COLOR)
             self.rect = self.image.get_rect(center=self.rect.center)
             logging.debug(f"Paddle shrunk to width {self.width}.")
         elif power_type == 'laser_paddle':
             self.original_color = self.color
             self.color = LASER_COLOR
-            self.image.fill(self.color)
+            self.image = sprite_image('paddle', (self.width, self.height), self.color)
             logging.debug("Laser Paddle activated.")
         elif power_type == 'explosive_ball':
             # No paddle modification required; handled in Ball class
@@ -229,21 +532,20 @@ class Paddle(pygame.sprite.Sprite):
         del self.active_powerups[power_type]
         if power_type in ['expand_paddle', 'shrink_paddle']:
             self.width = self.original_width
-            self.image = pygame.Surface([self.width, self.height])
-            self.image.fill(self.original_color)
+            self.image = sprite_image('paddle', (self.width, self.height), self.original_color)
             self.rect = self.image.get_rect(center=self.rect.center)
             logging.debug(f"Paddle restored to original width {self.width}.")
         elif power_type == 'laser_paddle':
             self.color = self.original_color
-            self.image.fill(self.color)
+            self.image = sprite_image('paddle', (self.width, self.height), self.color)
             logging.debug("Laser Paddle deactivated.")
 
     def shoot_laser(self):
         if 'laser_paddle' in self.active_powerups:
-            laser = Laser(self.rect.centerx, self.rect.top)
-            all_sprites.add(laser)
-            lasers.add(laser)
-            SOUND_EFFECTS['laser'].play()
+            laser = Laser(self.rect.centerx, self.rect.top, speed_scale=self.game.speed_scale)
+            self.game.all_sprites.add(laser)
+            self.game.lasers.add(laser)
+            self.game.play_sound('laser')
             logging.debug("Laser shot from Paddle.")
 
     def center_paddle(self):
@@ -252,15 +554,15 @@ class Paddle(pygame.sprite.Sprite):
         logging.debug(f"Paddle centered at ({self.rect.centerx}, {self.rect.centery}).")
 
 class Ball(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed_x=None, speed_y=-4, speed_increment=0):
+    def __init__(self, game, x, y, speed_x=None, speed_y=-4, speed_increment=0):
         super().__init__()
         logging.debug("Initializing Ball.")
-        self.radius = 10
+        self.game = game
+        self.radius = BALL_RADIUS
         self.color = WHITE  # Default color is white
         self.explosive = False  # Indicates if the ball is explosive
         self.original_color = self.color
-        self.image = pygame.Surface([self.radius*2, self.radius*2], pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
+        self.image = sprite_image('ball', (self.radius * 2, self.radius * 2), self.color)
         self.rect = self.image.get_rect(center=(x, y))
         self.x = float(x)
         self.y = float(y)
@@ -268,7 +570,7 @@ class Ball(pygame.sprite.Sprite):
         self.speed_increment_applied = False
         self.slow_effect = False
         self.speed_multiplier = 1.0
-        self.speed_x = speed_x if speed_x else random.choice([-BALL_SPEED / math.sqrt(2), BALL_SPEED / math.sqrt(2)])
+        self.speed_x = speed_x if speed_x else game.rng.choice([-BALL_SPEED / math.sqrt(2), BALL_SPEED / math.sqrt(2)])
         self.speed_y = speed_y if speed_y else -BALL_SPEED / math.sqrt(2)
         self.prev_rect = self.rect.copy()
         self.collided = False  # Flag to prevent multiple collisions per frame
@@ -278,8 +580,8 @@ class Ball(pygame.sprite.Sprite):
     def normalize_speed(self):
         speed = math.hypot(self.speed_x, self.speed_y)
         if speed != 0:
-            self.speed_x = (self.speed_x / speed) * BALL_SPEED * self.speed_multiplier
-            self.speed_y = (self.speed_y / speed) * BALL_SPEED * self.speed_multiplier
+            self.speed_x = (self.speed_x / speed) * BALL_SPEED * self.game.speed_scale * self.speed_multiplier
+            self.speed_y = (self.speed_y / speed) * BALL_SPEED * self.game.speed_scale * self.speed_multiplier
             # Log only if speed has changed significantly
             if hasattr(self, 'previous_speed'):
                 if not math.isclose(speed, math.hypot(self.previous_speed[0], self.previous_speed[1]), abs_tol=0.1):
@@ -302,6 +604,9 @@ class Ball(pygame.sprite.Sprite):
             self.speed_multiplier = 0.7
             self.normalize_speed()
 
+        if self.game.swept_collisions:
+            return  # Swept balls are moved by Game.sweep_ball() in handle_collisions()
+
         self.prev_rect = self.rect.copy()
         self.x += self.speed_x
         self.y += self.speed_y
@@ -311,7 +616,7 @@ class Ball(pygame.sprite.Sprite):
         # Collision with walls
         if self.rect.left <= 0:
             logging.info("Ball collided with the left wall.")
-            SOUND_EFFECTS['wall'].play()
+            self.game.play_sound('wall')
             self.speed_x = abs(self.speed_x)
             self.x = self.rect.x + 1
             self.normalize_speed()
@@ -319,7 +624,7 @@ class Ball(pygame.sprite.Sprite):
 
         if self.rect.right >= SCREEN_WIDTH:
             logging.info("Ball collided with the right wall.")
-            SOUND_EFFECTS['wall'].play()
+            self.game.play_sound('wall')
             self.speed_x = -abs(self.speed_x)
             self.x = self.rect.x - 1
             self.normalize_speed()
@@ -327,7 +632,7 @@ class Ball(pygame.sprite.Sprite):
 
         if self.rect.top <= 0:
             logging.info("Ball collided with the top wall.")
-            SOUND_EFFECTS['wall'].play()
+            self.game.play_sound('wall')
             self.speed_y = abs(self.speed_y)
             self.y = self.rect.y + 1
             self.normalize_speed()
@@ -339,7 +644,7 @@ class Ball(pygame.sprite.Sprite):
         self.y = float(y)
         self.rect.centerx = x
         self.rect.centery = y
-        self.speed_x = random.choice([-BALL_SPEED / math.sqrt(2), BALL_SPEED / math.sqrt(2)])
+        self.speed_x = self.game.rng.choice([-BALL_SPEED / math.sqrt(2), BALL_SPEED / math.sqrt(2)])
         self.speed_y = -BALL_SPEED / math.sqrt(2)
         self.speed_increment = 0
         self.speed_increment_applied = False
@@ -348,8 +653,7 @@ class Ball(pygame.sprite.Sprite):
         self.collided = False
         self.explosive = False  # Reset explosive state
         self.color = self.original_color  # Reset color
-        self.image.fill((0, 0, 0, 0))  # Clear the image
-        pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
+        self.image = sprite_image('ball', (self.radius * 2, self.radius * 2), self.color)
         self.normalize_speed()
         logging.debug(f"Ball reset with speed ({self.speed_x}, {self.speed_y}).")
 
@@ -371,23 +675,22 @@ class Ball(pygame.sprite.Sprite):
         if not self.explosive:
             self.explosive = True
             self.color = EXPLOSIVE_BALL_COLOR  # Change color to red
-            self.image.fill((0, 0, 0, 0))      # Clear the image
-            pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
+            self.image = sprite_image('ball', (self.radius * 2, self.radius * 2), self.color)
             logging.debug("Ball is now explosive.")
 
     def revert_to_regular(self):
         if self.explosive:
             self.explosive = False
             self.color = self.original_color
-            self.image.fill((0, 0, 0, 0))      # Clear the image
-            pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
+            self.image = sprite_image('ball', (self.radius * 2, self.radius * 2), self.color)
             logging.debug("Ball reverted to regular state.")
 
 class Brick(pygame.sprite.Sprite):
-    def __init__(self, x, y, hits=1, color=GREEN):
+    def __init__(self, game, x, y, hits=1, color=GREEN):
         super().__init__()
-        self.width = 60
-        self.height = 20
+        self.game = game
+        self.width = BRICK_WIDTH
+        self.height = BRICK_HEIGHT
         self.hits = hits
         self.max_hits = hits
         self.color = color
@@ -404,59 +707,81 @@ class Brick(pygame.sprite.Sprite):
             self.image.fill(self.color)
             logging.debug(f"Brick color changed to {self.color}.")
         else:
-            SOUND_EFFECTS['brick'].play()
+            self.game.play_sound('brick')
             self.kill()
             logging.info(f"Brick at ({self.rect.x}, {self.rect.y}) destroyed.")
             # Drop power-up with 20% chance
-            if random.random() < 0.2:
-                powerup = PowerUp(self.rect.centerx, self.rect.centery)
-                all_powerups.add(powerup)
-                all_sprites.add(powerup)
+            if self.game.rng.random() < 0.2:
+                powerup = PowerUp(self.rect.centerx, self.rect.centery, speed_scale=self.game.speed_scale, rng=self.game.rng)
+                self.game.all_powerups.add(powerup)
+                self.game.all_sprites.add(powerup)
                 logging.debug("Power-up dropped by brick.")
+            if self.game.explosive_bricks and self.game.rng.random() < EXPLOSIVE_BRICK_CHANCE:
+                self.game.explode_bricks([self])
+
+    def kill(self):
+        super().kill()
+        self.game.brick_grid.remove(self)
+
+@functools.lru_cache(maxsize=None)
+def explosion_frames(max_radius, color, duration):
+    """(image, offset from the centre) of each frame of an Explosion; frame 0 is empty."""
+    frames = [(pygame.Surface((0, 0), pygame.SRCALPHA), (0, 0))]
+    canvas = pygame.Surface((max_radius * 2, max_radius * 2), pygame.SRCALPHA)
+    current_radius = 10
+    for frame in range(duration):
+        growth_rate = (max_radius - current_radius) / (duration - frame)
+        current_radius += growth_rate
+        canvas.fill((0, 0, 0, 0))
+        alpha = max(min(255 - int((255 / duration) * frame), 255), 0)
+        pygame.draw.circle(canvas, color + (alpha,), (max_radius, max_radius), int(current_radius))
+        bounds = canvas.get_bounding_rect()
+        image = canvas.subsurface(bounds).copy()
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        frames.append((image, (bounds.x - max_radius, bounds.y - max_radius)))
+    return tuple(frames)
 
 class Explosion(pygame.sprite.Sprite):
-    def __init__(self, x, y, max_radius=100, color=EXPLOSION_COLOR, duration=30):
+    def __init__(self, game, x, y, max_radius=100, color=EXPLOSION_COLOR, duration=0.5):
         super().__init__()
         self.x = x
         self.y = y
         self.max_radius = max_radius  # Set blast radius to 100 pixels
-        self.current_radius = 10
         self.color = color
-        self.duration = duration
+        self.duration = game.seconds_to_ticks(duration)
         self.frame = 0
-        self.image = pygame.Surface((self.max_radius*2, self.max_radius*2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-        all_sprites.add(self)
+        self.frames = explosion_frames(max_radius, color, self.duration)
+        self.show_frame()
+        game.all_sprites.add(self)
         logging.debug(f"Explosion created at ({self.x}, {self.y}).")
 
+    def show_frame(self):
+        self.image, (dx, dy) = self.frames[self.frame]
+        self.rect = self.image.get_rect(topleft=(self.x + dx, self.y + dy))
+
     def update(self):
         if self.frame < self.duration:
-            growth_rate = (self.max_radius - self.current_radius) / (self.duration - self.frame)
-            self.current_radius += growth_rate
-            self.image.fill((0, 0, 0, 0))
-            alpha = max(255 - int((255 / self.duration) * self.frame), 0)
-            # Ensure alpha is within valid range
-            alpha = max(min(alpha, 255), 0)
-            explosion_color = self.color + (alpha,)
-            pygame.draw.circle(self.image, explosion_color, (self.max_radius, self.max_radius), int(self.current_radius))
             self.frame += 1
+            self.show_frame()
         else:
             self.kill()
 
 class Laser(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, speed_scale=1.0):
         super().__init__()
         self.width = 4
         self.height = 20
         self.color = YELLOW
-        self.image = pygame.Surface([self.width, self.height])
-        self.image.fill(self.color)
+        self.image = sprite_image('laser', (self.width, self.height), self.color)
         self.rect = self.image.get_rect(centerx=x, bottom=y)
-        self.speed_y = -10
+        self.y = float(self.rect.y)
+        self.speed_y = -10 * speed_scale
         logging.debug(f"Laser created at ({x}, {y}).")
 
     def update(self):
-        self.rect.y += self.speed_y
+        self.y += self.speed_y
+        self.rect.y = round(self.y)
         if self.rect.bottom < 0:
             self.kill()
             logging.debug("Laser removed for moving out of screen.")
@@ -472,185 +797,978 @@ class PowerUp(pygame.sprite.Sprite):
         'explosive_ball': EXPLOSIVE_BALL_COLOR  # Added explosive_ball color
     }
 
-    def __init__(self, x, y, power_type=None):
+    def __init__(self, x, y, power_type=None, speed_scale=1.0, rng=random):
         super().__init__()
         self.width = 20
         self.height = 20
-        self.power_type = power_type if power_type else random.choice(POWERUP_TYPES)
+        self.power_type = power_type if power_type else rng.choice(POWERUP_TYPES)
         self.color = self.COLOR_MAPPING.get(self.power_type, WHITE)
-        self.image = pygame.Surface([self.width, self.height])
-        self.image.fill(self.color)
+        self.image = sprite_image('powerup', (self.width, self.height), self.color)
         self.rect = self.image.get_rect(center=(x, y))
-        self.speed_y = 3
+        self.y = float(self.rect.y)
+        self.speed_y = 3 * speed_scale
         logging.debug(f"PowerUp '{self.power_type}' created at ({x}, {y}).")
 
     def update(self):
-        self.rect.y += self.speed_y
+        self.y += self.speed_y
+        self.rect.y = round(self.y)
         if self.rect.top > SCREEN_HEIGHT:
             self.kill()
             logging.debug(f"PowerUp '{self.power_type}' removed for moving out of screen.")
 
+@functools.lru_cache(maxsize=None)
+def caption_image(text, color=WHITE):
+    """A message caption rendered once, in the atlas shared by every PowerUpMessage."""
+    return get_font("Arial", 24).render(text, True, color).convert_alpha()
+
+def prerender_captions():
+    """Fill the caption atlas with every power-up message before play starts."""
+    for text in (*POWERUP_CAPTIONS.values(), DEFAULT_POWERUP_CAPTION):
+        caption_image(text)
+
 class PowerUpMessage(pygame.sprite.Sprite):
-    def __init__(self, text, duration=60, position=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100), color=WHITE):
+    def __init__(self, game, text, duration=1.0, position=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100), color=WHITE):
         super().__init__()
-        self.duration = duration
+        self.duration = game.seconds_to_ticks(duration)
         self.frame = 0
-        self.font = pygame.font.SysFont("Arial", 24)
         self.text = text
         self.color = color
-        self.image = self.font.render(self.text, True, self.color)
-        self.image = self.image.convert_alpha()
+        self.image = caption_image(self.text, self.color).copy()  # Its own copy to fade out
         self.rect = self.image.get_rect(center=position)
         self.alpha = 255
-        self.velocity_y = 1
-        all_sprites.add(self)
+        self.y = float(self.rect.y)
+        self.velocity_y = game.speed_scale
+        game.messages.add(self)
         logging.debug(f"PowerUpMessage '{self.text}' created at {position}.")
 
     def update(self):
         if self.frame < self.duration:
-            self.rect.y += self.velocity_y
+            self.y += self.velocity_y
+            self.rect.y = round(self.y)
             fade_factor = 255 * (1 - self.frame / self.duration)
             self.image.set_alpha(int(fade_factor))
             self.frame += 1
         else:
             self.kill()
 
-# ========================== Sprite Groups ==========================
-all_sprites = pygame.sprite.Group()
-bricks = pygame.sprite.Group()
-all_powerups = pygame.sprite.Group()
-balls = pygame.sprite.Group()
-lasers = pygame.sprite.Group()
-messages = pygame.sprite.Group()
-
-# ========================== Brick Creation ==========================
-def create_bricks(rows, cols, level=1):
-    logging.info(f"Creating bricks: rows={rows}, cols={cols}, level={level}.")
-    padding = 5
-    offset_x = (SCREEN_WIDTH - (cols * (60 + padding))) / 2
-    offset_y = 60
-    for row in range(rows):
-        for col in range(cols):
-            x = offset_x + col * (60 + padding)
-            y = offset_y + row * (20 + padding)
-            # Simplified brick creation without explosive bricks
-            hits = 1
-            color = [RED, GREEN, YELLOW, ORANGE, PURPLE][row % 5]
-            brick = Brick(x, y, hits, color)
-            bricks.add(brick)
-            all_sprites.add(brick)
-    logging.info(f"{len(bricks)} bricks created for level {level}.")
-
-# ========================== Game Management Functions ==========================
-def clear_active_powerups():
-    logging.debug("Clearing all active power-ups.")
-    # Deactivate paddle power-ups
-    for power in list(paddle.active_powerups.keys()):
-        paddle.deactivate_powerup(power)
-    # Deactivate ball power-ups
-    for ball in balls:
-        if ball.explosive:
-            ball.revert_to_regular()
-
-def apply_powerup(power_type):
-    global lives
-    logging.debug(f"Applying power-up: {power_type}.")
-    instant_powerups = ['extra_life', 'multi_ball']
-    if power_type not in instant_powerups:
-        clear_active_powerups()
-    if power_type == 'expand_paddle':
-        paddle.activate_powerup('expand_paddle')
-    elif power_type == 'extra_life':
-        lives += 1
-        logging.info(f"Extra life granted. Lives: {lives}.")
-    elif power_type == 'multi_ball':
-        if len(balls) >= MAX_BALLS:
-            logging.warning("Maximum number of balls reached. Multi-ball power-up not applied.")
-            return
-        ball = random.choice(list(balls))
-        angle = math.atan2(ball.speed_y, ball.speed_x)
-        speed_variation = math.radians(15)
-        speed = math.hypot(ball.speed_x, ball.speed_y)
-        new_angle1 = angle + speed_variation
-        new_angle2 = angle - speed_variation
-        new_speed_x1 = speed * math.cos(new_angle1)
-        new_speed_y1 = speed * math.sin(new_angle1)
-        new_speed_x2 = speed * math.cos(new_angle2)
-        new_speed_y2 = speed * math.sin(new_angle2)
-        new_ball1 = Ball(ball.x, ball.y, speed_x=new_speed_x1, speed_y=new_speed_y1)
-        new_ball2 = Ball(ball.x, ball.y, speed_x=new_speed_x2, speed_y=new_speed_y2)
-        balls.add(new_ball1, new_ball2)
-        all_sprites.add(new_ball1, new_ball2)
-        logging.debug("Multi-ball power-up applied: two new balls created.")
-        logging.info(f"Total balls after multi-ball power-up: {len(balls)}.")
-    elif power_type == 'shrink_paddle':
-        paddle.activate_powerup('shrink_paddle')
-    elif power_type == 'slow_ball':
-        for ball in balls:
-            ball.apply_slow()
-    elif power_type == 'laser_paddle':
-        paddle.activate_powerup('laser_paddle')
-    elif power_type == 'explosive_ball':
-        # Make all existing balls explosive
-        for ball in balls:
-            ball.make_explosive()
-    else:
-        logging.warning(f"Unknown power-up type: {power_type}.")
+# ========================== Spatial Index ==========================
+BLAST_SCAN_MAX_DETONATIONS = 8  # Blasts from up to this many points skip NumPy; see BrickLattice.blast_indices()
+
+@functools.lru_cache(maxsize=None)
+def blast_stencil(radius, cell_width, cell_height, brick_width, brick_height):
+    """Cell offsets (rows, cols) whose brick centre can lie within radius of a point in the origin cell."""
+    def nearest(lo, hi):
+        return 0 if lo <= 0 <= hi else min(abs(lo), abs(hi))
+
+    reach_cols = radius // cell_width + 2
+    reach_rows = radius // cell_height + 2
+    row_offsets = []
+    col_offsets = []
+    for d_row in range(-reach_rows, reach_rows + 1):
+        # Vertical distance from any point in the origin cell to the brick centre d_row cells away
+        dy = nearest(d_row * cell_height + brick_height // 2 - cell_height, d_row * cell_height + brick_height // 2)
+        for d_col in range(-reach_cols, reach_cols + 1):
+            dx = nearest(d_col * cell_width + brick_width // 2 - cell_width, d_col * cell_width + brick_width // 2)
+            if dx * dx + dy * dy <= radius * radius:
+                row_offsets.append(d_row)
+                col_offsets.append(d_col)
+    return np.array(row_offsets, dtype=np.int64), np.array(col_offsets, dtype=np.int64)
+
+@functools.lru_cache(maxsize=None)
+def adjacency_stencil(reach, cell_width, cell_height):
+    """Cell offsets (rows, cols) of bricks less than reach px away on both axes, excluding the brick itself."""
+    reach_rows = (reach - 1) // cell_height
+    reach_cols = (reach - 1) // cell_width
+    offsets = [(d_row, d_col)
+               for d_row in range(-reach_rows, reach_rows + 1)
+               for d_col in range(-reach_cols, reach_cols + 1)
+               if d_row or d_col]
+    return (np.array([d_row for d_row, d_col in offsets], dtype=np.int64),
+            np.array([d_col for d_row, d_col in offsets], dtype=np.int64))
+
+class BrickLattice:
+    """Geometry and alive flags shared by the brick stores; cell row * cols + col holds at most one brick."""
+
+    def __init__(self, rows, cols, brick_width=BRICK_WIDTH, brick_height=BRICK_HEIGHT, padding=BRICK_PADDING):
+        self.rows = rows
+        self.cols = cols
+        self.brick_width = brick_width
+        self.brick_height = brick_height
+        self.cell_width = brick_width + padding
+        self.cell_height = brick_height + padding
+        self.origin = None
+        self.alive = np.zeros(rows * cols, dtype=bool)
+        self.alive_cells = memoryview(self.alive)  # Same flags; indexing it is much cheaper than the array
+        self.alive_count = 0
+        self.lowest = None  # (alive_count, lowest_rows()) for the bricks left when it was computed
+
+    def __len__(self):
+        return self.alive_count
+
+    def cell_span(self, rect):
+        origin_x, origin_y = self.origin
+        col_start = max((rect.left - origin_x) // self.cell_width, 0)
+        col_end = min((rect.right - 1 - origin_x) // self.cell_width, self.cols - 1)
+        row_start = max((rect.top - origin_y) // self.cell_height, 0)
+        row_end = min((rect.bottom - 1 - origin_y) // self.cell_height, self.rows - 1)
+        return row_start, row_end, col_start, col_end
+
+    def stencil_indices(self, rows, cols, stencil):
+        """Sorted, unique indices of live bricks under a stencil applied around each (row, col)."""
+        row_offsets, col_offsets = stencil
+        rows = np.asarray(rows, dtype=np.int64)
+        overlapping = len(rows) > 1
+        rows = (rows[:, None] + row_offsets).ravel()
+        cols = (np.asarray(cols, dtype=np.int64)[:, None] + col_offsets).ravel()
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        indices = rows[inside] * self.cols + cols[inside]
+        if overlapping:
+            # Stencils around different cells can overlap; a single stencil is already sorted
+            indices = np.unique(indices)
+        return indices[self.alive[indices]]
+
+    def blast_indices(self, xs, ys, radius):
+        """Sorted indices of live bricks whose centre is within radius of any detonation (x, y)."""
+        if self.origin is None or self.alive_count == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(xs) <= BLAST_SCAN_MAX_DETONATIONS:
+            # A handful of distance tests per point beats NumPy's per-call overhead, whatever the board size
+            return self.blast_scan_indices(xs, ys, radius)
+        return self.blast_stencil_indices(xs, ys, radius)
+
+    def blast_scan_indices(self, xs, ys, radius):
+        """blast_indices() by testing the bricks within radius of each detonation on both axes."""
+        origin_x, origin_y = self.origin
+        cell_width, cell_height, cols = self.cell_width, self.cell_height, self.cols
+        # Brick centres are at origin + cell * (col, row)
+        origin_x += self.brick_width // 2
+        origin_y += self.brick_height // 2
+        alive = self.alive_cells
+        limit = radius * radius
+        found = set()
+        for x, y in zip(xs, ys):
+            col_start = max(-((origin_x - x + radius) // cell_width), 0)
+            col_end = min((x + radius - origin_x) // cell_width, cols - 1)
+            for row in range(max(-((origin_y - y + radius) // cell_height), 0),
+                             min((y + radius - origin_y) // cell_height, self.rows - 1) + 1):
+                dy = (origin_y + row * cell_height - y) ** 2
+                for col in range(col_start, col_end + 1):
+                    if (origin_x + col * cell_width - x) ** 2 + dy <= limit and alive[row * cols + col]:
+                        found.add(row * cols + col)
+        return np.array(sorted(found), dtype=np.int64)
+
+    def blast_stencil_indices(self, xs, ys, radius):
+        """blast_indices() from the cells around each detonation."""
+        origin_x, origin_y = self.origin
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        stencil = blast_stencil(radius, self.cell_width, self.cell_height, self.brick_width, self.brick_height)
+        indices = self.stencil_indices((ys - origin_y) // self.cell_height,
+                                       (xs - origin_x) // self.cell_width, stencil)
+        # Exact test of every candidate centre against every detonation in one pass
+        rows, cols = np.divmod(indices, self.cols)
+        centers_x = origin_x + cols * self.cell_width + self.brick_width // 2
+        centers_y = origin_y + rows * self.cell_height + self.brick_height // 2
+        distances = (centers_x[:, None] - xs) ** 2 + (centers_y[:, None] - ys) ** 2
+        return indices[(distances <= radius * radius).any(axis=1)]
+
+    def touching(self, lefts, tops, width, height):
+        """Mask of which width x height rects (no larger than a cell) at (lefts, tops) overlap a live cell."""
+        lefts = np.asarray(lefts, dtype=np.int64)
+        tops = np.asarray(tops, dtype=np.int64)
+        if self.origin is None or self.alive_count == 0:
+            return np.zeros(len(lefts), dtype=bool)
+        origin_x, origin_y = self.origin
+        touching = np.zeros(len(lefts), dtype=bool)
+        # Such a rect spans at most 2x2 cells, so the cells under its corners are all it touches
+        for x in (lefts, lefts + width - 1):
+            cols = (x - origin_x) // self.cell_width
+            for y in (tops, tops + height - 1):
+                rows = (y - origin_y) // self.cell_height
+                inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+                indices = np.where(inside, rows * self.cols + cols, 0)
+                touching |= inside & self.alive[indices]
+        return touching
+
+    def adjacent_indices(self, sources, reach):
+        """Sorted indices of live bricks less than reach px from any source brick on both axes."""
+        if self.alive_count == 0:
+            return np.empty(0, dtype=np.int64)
+        rows, cols = np.divmod(np.asarray(sources, dtype=np.int64), self.cols)
+        return self.stencil_indices(rows, cols, adjacency_stencil(reach, self.cell_width, self.cell_height))
+
+    def lowest_rows(self):
+        """The row of the lowest live brick in each column, or -1 for an empty column."""
+        if self.lowest is None or self.lowest[0] != self.alive_count:
+            alive = self.alive.reshape(self.rows, self.cols)
+            lowest = self.rows - 1 - alive[::-1].argmax(axis=0)
+            lowest[~alive.any(axis=0)] = -1
+            self.lowest = (self.alive_count, lowest.tolist())
+        return self.lowest[1]
+
+    def laser_indices(self, lasers):
+        """Indices of the bricks each (rect, rise) laser hits, or None if it needs a collide() test."""
+        if not lasers or self.origin is None or self.alive_count == 0:
+            return [[] for _ in lasers]
+        origin_x, origin_y = self.origin
+        cell_width, cell_height, brick_width, brick_height = self.cell_width, self.cell_height, self.brick_width, self.brick_height
+        lowest = self.lowest_rows()
+        board_bottom = origin_y + max(lowest) * cell_height + brick_height
+        last_col = self.cols - 1
+        found = []
+        for rect, rise in lasers:
+            hits = []
+            if rect.top < board_bottom and rect.bottom > origin_y:
+                start_top = rect.top + rise
+                # Moving straight up, the first brick a laser can reach in a column is the lowest live one
+                for col in range(max((rect.left - origin_x) // cell_width, 0),
+                                 min((rect.right - 1 - origin_x) // cell_width, last_col) + 1):
+                    row = lowest[col]
+                    left = origin_x + col * cell_width
+                    if row < 0 or rect.right <= left or rect.left >= left + brick_width:
+                        continue
+                    bottom = origin_y + row * cell_height + brick_height
+                    if start_top < bottom:
+                        hits = None  # Already among the bricks: left over from before this board
+                        break
+                    if rect.top < bottom:
+                        hits.append(row * self.cols + col)
+            found.append(hits)
+        return found
+
+    def laser_hits(self, lasers):
+        """The bricks each (rect, rise) in lasers hits; see laser_indices()."""
+        return [self.collide(rect) if indices is None else self.bricks_at(indices)
+                for (rect, _), indices in zip(lasers, self.laser_indices(lasers))]
+
+    def blast(self, xs, ys, radius):
+        return self.bricks_at(self.blast_indices(xs, ys, radius))
+
+    def adjacent(self, bricks, reach):
+        return self.bricks_at(self.adjacent_indices([brick.grid_index for brick in bricks], reach))
+
+class BrickGrid(BrickLattice):
+    """Index of Brick sprites by lattice cell."""
+
+    def __init__(self, rows, cols, brick_width=BRICK_WIDTH, brick_height=BRICK_HEIGHT, padding=BRICK_PADDING):
+        super().__init__(rows, cols, brick_width, brick_height, padding)
+        self.cells = [None] * (rows * cols)
+
+    def add(self, brick, row, col):
+        # Take the origin from the first brick so it matches pygame's rounding of
+        # fractional brick positions
+        if self.origin is None:
+            self.origin = (brick.rect.x - col * self.cell_width, brick.rect.y - row * self.cell_height)
+        index = row * self.cols + col
+        self.cells[index] = brick
+        self.alive[index] = True
+        self.alive_count += 1
+        self.lowest = None
+        brick.grid_index = index
+
+    def remove(self, brick):
+        index = getattr(brick, 'grid_index', None)
+        if index is not None and index < len(self.cells) and self.cells[index] is brick:
+            self.cells[index] = None
+            self.alive[index] = False
+            self.alive_count -= 1
+
+    def clear(self):
+        self.cells = [None] * (self.rows * self.cols)
+        self.alive[:] = False
+        self.alive_count = 0
+        self.lowest = None
+
+    def bricks_at(self, indices):
+        return [self.cells[index] for index in indices]
+
+    def collide(self, rect):
+        """Same result as pygame.sprite.spritecollide against the brick group."""
+        if self.origin is None:
+            return []
+        row_start, row_end, col_start, col_end = self.cell_span(rect)
+        found = []
+        for row in range(row_start, row_end + 1):
+            base = row * self.cols
+            for col in range(col_start, col_end + 1):
+                brick = self.cells[base + col]
+                if brick is not None and rect.colliderect(brick.rect):
+                    found.append(brick)
+        return found
+
+# ========================== Brick Field ==========================
+class FieldBrick:
+    """Handle to one brick in a BrickField, with the rect/hits/hit()/kill() interface of Brick."""
+    __slots__ = ('field', 'grid_index')
+
+    def __init__(self, field, grid_index):
+        self.field = field
+        self.grid_index = grid_index
+
+    @property
+    def rect(self):
+        return self.field.brick_rect(self.grid_index)
+
+    @property
+    def hits(self):
+        return int(self.field.hits[self.grid_index])
 
-def set_volume(new_volume):
-    global VOLUME
-    VOLUME = new_volume
-    for sound in SOUND_EFFECTS.values():
-        sound.set_volume(VOLUME)
-    logging.debug(f"Volume set to {VOLUME * 100}%.")
+    def hit(self):
+        self.field.hit(self.grid_index)
+
+    def kill(self):
+        self.field.kill(self.grid_index)
+
+class BrickField(BrickLattice):
+    """Array-backed store for a whole board of bricks, drawn from one opaque texture."""
+
+    def __init__(self, game, rows, cols, offset_x, offset_y, hits=1,
+                 brick_width=BRICK_WIDTH, brick_height=BRICK_HEIGHT, padding=BRICK_PADDING, background=None):
+        super().__init__(rows, cols, brick_width, brick_height, padding)
+        self.game = game
+        self.background = background if background is not None else level_background(game.current_level)
+        self.handles = [None] * (rows * cols)  # Index -> its FieldBrick, once something has touched it
+
+        row_index, col_index = np.divmod(np.arange(rows * cols), cols)
+        # The same positions Brick(x, y) sprites get from pygame
+        self.x = np.floor(offset_x + col_index * self.cell_width + 0.5).astype(np.int32)
+        self.y = np.floor(offset_y + row_index * self.cell_height + 0.5).astype(np.int32)
+        self.hits = np.full(rows * cols, hits, dtype=np.int16)
+        self.max_hits = self.hits.copy()
+        palette = np.array([RED, GREEN, YELLOW, ORANGE, PURPLE], dtype=np.uint8)
+        self.color = palette[row_index % len(palette)]
+        self.alive[:] = True
+        self.alive_count = rows * cols
+        self.origin = (int(self.x[0]), int(self.y[0])) if rows * cols else (0, 0)
+
+        self.texture = None
+        if not game.headless:
+            self.texture = self.render_texture()
+
+    # ---------------------- Rendering ----------------------
+    def render_texture(self):
+        # Paint every brick into one board-sized texture in a single array pass
+        texture = pygame.Surface((self.cols * self.cell_width, self.rows * self.cell_height))
+        cell_colors = pygame.surfarray.map_array(texture, self.color.reshape(self.rows, self.cols, 3).transpose(1, 0, 2))
+        cell_mask = np.zeros((self.cell_width, self.cell_height), dtype=bool)
+        cell_mask[:self.brick_width, :self.brick_height] = True
+        pixels = pygame.surfarray.pixels2d(texture)
+        pixels[...] = np.where(np.tile(cell_mask, (self.cols, self.rows)),
+                               cell_colors.repeat(self.cell_width, axis=0).repeat(self.cell_height, axis=1),
+                               texture.map_rgb(self.background))
+        del pixels  # Release the surface lock
+        if pygame.display.get_surface() is not None:
+            texture = texture.convert()
+        return texture
+
+    def paint(self, index, color):
+        if self.texture is not None:
+            local_rect = self.brick_rect(index).move(-self.origin[0], -self.origin[1])
+            self.texture.fill(color, local_rect)
+
+    def draw(self, surface):
+        if self.texture is not None:
+            surface.blit(self.texture, self.origin)
+
+    # ---------------------- Queries ----------------------
+    def brick_rect(self, index):
+        return pygame.Rect(int(self.x[index]), int(self.y[index]), self.brick_width, self.brick_height)
+
+    def handle(self, index):
+        brick = self.handles[index]
+        if brick is None:
+            brick = self.handles[index] = FieldBrick(self, index)
+        return brick
+
+    def collide(self, rect):
+        """Live bricks overlapping rect, in creation (row-major) order."""
+        origin_x, origin_y = self.origin
+        cell_width, cell_height, cols = self.cell_width, self.cell_height, self.cols
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        col_start = max((left - origin_x) // cell_width, 0)
+        col_end = min((right - 1 - origin_x) // cell_width, cols - 1)
+        row_start = max((top - origin_y) // cell_height, 0)
+        row_end = min((bottom - 1 - origin_y) // cell_height, self.rows - 1)
+        # Only the first row and column can be missed, by a rect starting in the padding after their bricks
+        if left >= origin_x + col_start * cell_width + self.brick_width:
+            col_start += 1
+        if top >= origin_y + row_start * cell_height + self.brick_height:
+            row_start += 1
+        alive, handles = self.alive_cells, self.handles
+        found = []
+        for row in range(row_start, row_end + 1):
+            base = row * cols
+            for index in range(base + col_start, base + col_end + 1):
+                if alive[index]:
+                    brick = handles[index]
+                    if brick is None:
+                        brick = handles[index] = FieldBrick(self, index)
+                    found.append(brick)
+        return found
+
+    def bricks_at(self, indices):
+        return [self.handle(index) for index in indices]
+
+    # ---------------------- Damage ----------------------
+    def hit(self, index):
+        x = int(self.x[index])
+        y = int(self.y[index])
+        logging.info(f"Brick at ({x}, {y}) was hit. Remaining hits: {self.hits[index] - 1}.")
+        self.hits[index] -= 1
+        if self.hits[index] > 0:
+            color_intensity = int(255 * (self.hits[index] / self.max_hits[index]))
+            self.color[index] = (color_intensity, 0, 255 - color_intensity)
+            color = tuple(self.color[index].tolist())
+            self.paint(index, color)
+            logging.debug(f"Brick color changed to {color}.")
+        else:
+            self.game.play_sound('brick')
+            self.kill(index)
+            logging.info(f"Brick at ({x}, {y}) destroyed.")
+            # Drop power-up with 20% chance
+            if self.game.rng.random() < 0.2:
+                rect = self.brick_rect(index)
+                powerup = PowerUp(rect.centerx, rect.centery, speed_scale=self.game.speed_scale, rng=self.game.rng)
+                self.game.all_powerups.add(powerup)
+                self.game.all_sprites.add(powerup)
+                logging.debug("Power-up dropped by brick.")
+            if self.game.explosive_bricks and self.game.rng.random() < EXPLOSIVE_BRICK_CHANCE:
+                self.game.explode_bricks([self.handle(index)])
+
+    def kill(self, index):
+        if self.alive[index]:
+            self.alive[index] = False
+            self.alive_count -= 1
+            self.paint(index, self.background)
+
+# ========================== Ball Batch ==========================
+class BatchBall:
+    """Handle to one ball in a BallBatch, valid until the batch's next update()."""
+    __slots__ = ('batch', 'index', 'rect', 'collided')
+    radius = BALL_RADIUS
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+        size = batch.size
+        self.rect = pygame.Rect(int(batch.rect_x[index]), int(batch.rect_y[index]), size, size)
+        self.collided = False
 
-def reset_game():
-    global score, lives, game_over, win, current_level
-
-    logging.info("Resetting game.")
-    score = 0
-    lives = 3
-    game_over = False
-    win = False
-    current_level = 1
-    level_start = True
-
-    # Clear all sprite groups except paddle
-    bricks.empty()
-    all_powerups.empty()
-    lasers.empty()
-    messages.empty()
-    all_sprites.empty()
-    balls.empty()
-
-    # Recreate Paddle
-    global paddle
-    paddle = Paddle()
-    # Removed adding paddle to all_sprites
-
-    # Reset Volume
-    set_volume(0.1)
-    logging.debug("Volume reset to default.")
-
-def change_background(level):
-    level_colors = [
-        BLACK,
-        (10, 10, 50),
-        (50, 10, 10),
-        (10, 50, 10),
-        (50, 50, 10),
-        (10, 50, 50)
-    ]
-    color = level_colors[level % len(level_colors)]
-    screen.fill(color)
+    @property
+    def prev_rect(self):
+        batch = self.batch
+        return pygame.Rect(int(batch.prev_x[self.index]), int(batch.prev_y[self.index]), batch.size, batch.size)
+
+    @property
+    def x(self):
+        return float(self.batch.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.batch.x[self.index] = value
+        self.batch.rect_x[self.index] = round(value)
+
+    @property
+    def y(self):
+        return float(self.batch.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.batch.y[self.index] = value
+        self.batch.rect_y[self.index] = round(value)
+
+    @property
+    def speed_x(self):
+        return float(self.batch.speed_x[self.index])
+
+    @speed_x.setter
+    def speed_x(self, value):
+        self.batch.speed_x[self.index] = value
 
-# ========================== Collision Handling ==========================
-def handle_collisions():
-    global score, lives, game_over, win, current_level, high_score
+    @property
+    def speed_y(self):
+        return float(self.batch.speed_y[self.index])
 
-    level_completed = False  # Flag to indicate level completion
+    @speed_y.setter
+    def speed_y(self, value):
+        self.batch.speed_y[self.index] = value
 
-    for ball in balls:
+    @property
+    def speed_multiplier(self):
+        return float(self.batch.speed_multiplier[self.index])
+
+    @speed_multiplier.setter
+    def speed_multiplier(self, value):
+        self.batch.speed_multiplier[self.index] = value
+
+    @property
+    def slow_effect(self):
+        return bool(self.batch.slow[self.index])
+
+    @property
+    def explosive(self):
+        return bool(self.batch.explosive[self.index])
+
+    def normalize_speed(self):
+        speed_x, speed_y = self.speed_x, self.speed_y
+        speed = math.hypot(speed_x, speed_y)
+        if speed != 0:
+            scale = BALL_SPEED * self.batch.game.speed_scale * self.speed_multiplier / speed
+            self.speed_x = speed_x * scale
+            self.speed_y = speed_y * scale
+
+    def apply_slow(self, duration=POWERUP_DURATION):
+        if not self.slow_effect:
+            self.batch.slow[self.index] = True
+            self.speed_multiplier = 0.7
+            self.normalize_speed()
+
+    def remove_slow(self):
+        if self.slow_effect:
+            self.batch.slow[self.index] = False
+            self.speed_multiplier = 1.0
+            self.normalize_speed()
+
+    def make_explosive(self):
+        self.batch.explosive[self.index] = True
+
+    def revert_to_regular(self):
+        self.batch.explosive[self.index] = False
+
+    def kill(self):
+        self.batch.kill(self.index)
+
+class BallBatch:
+    """Array-backed store for any number of balls, moved in one vectorised pass per tick."""
+
+    ARRAYS = ('x', 'y', 'speed_x', 'speed_y', 'speed_multiplier', 'rect_x', 'rect_y',
+              'prev_x', 'prev_y', 'slow', 'explosive', 'alive')
+
+    def __init__(self, game, capacity=64, size=BALL_RADIUS * 2):
+        self.game = game
+        self.size = size
+        self.count = 0          # Rows in use, including killed balls until the next compaction
+        self.alive_count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.speed_multiplier = np.ones(capacity)
+        self.rect_x = np.zeros(capacity, dtype=np.int64)
+        self.rect_y = np.zeros(capacity, dtype=np.int64)
+        self.prev_x = np.zeros(capacity, dtype=np.int64)
+        self.prev_y = np.zeros(capacity, dtype=np.int64)
+        self.slow = np.zeros(capacity, dtype=bool)
+        self.explosive = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.images = None
+
+    # ---------------------- Group Interface ----------------------
+    def __len__(self):
+        return self.alive_count
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def sprites(self):
+        return [BatchBall(self, index) for index in np.flatnonzero(self.alive[:self.count]).tolist()]
+
+    def copy(self):
+        return self.sprites()
+
+    def empty(self):
+        self.alive[:self.count] = False
+        self.count = 0
+        self.alive_count = 0
+
+    def spawn(self, x, y, speed_x=None, speed_y=-4):
+        """Add a ball centred on (x, y), choosing its speed the way Ball does."""
+        if self.count == len(self.x):
+            for name in self.ARRAYS:
+                array = getattr(self, name)
+                grown = np.zeros(len(array) * 2, dtype=array.dtype)
+                grown[:len(array)] = array
+                setattr(self, name, grown)
+        index = self.count
+        self.count += 1
+        self.alive_count += 1
+        speed_x = speed_x if speed_x else self.game.rng.choice([-BALL_SPEED / math.sqrt(2), BALL_SPEED / math.sqrt(2)])
+        speed_y = speed_y if speed_y else -BALL_SPEED / math.sqrt(2)
+        left = math.floor(x - self.size / 2 + 0.5)  # As Surface.get_rect(center=...) rounds it
+        top = math.floor(y - self.size / 2 + 0.5)
+        self.x[index], self.y[index] = x, y
+        self.rect_x[index] = self.prev_x[index] = left
+        self.rect_y[index] = self.prev_y[index] = top
+        self.speed_multiplier[index] = 1.0
+        self.slow[index] = self.explosive[index] = False
+        self.alive[index] = True
+        ball = BatchBall(self, index)
+        ball.speed_x, ball.speed_y = speed_x, speed_y
+        ball.normalize_speed()
+        return ball
+
+    def kill(self, index):
+        if self.alive[index]:
+            self.alive[index] = False
+            self.alive_count -= 1
+
+    def compact(self):
+        # Drop killed rows so the live balls are contiguous again
+        if self.alive_count == self.count:
+            return
+        keep = np.flatnonzero(self.alive[:self.count])
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            array[:len(keep)] = array[keep]
+        self.alive[len(keep):self.count] = False
+        self.count = len(keep)
+
+    # ---------------------- Physics ----------------------
+    def update(self):
+        """Move every ball one tick and reflect it off the side and top walls."""
+        self.compact()
+        count = self.count
+        if count == 0:
+            return
+        x, y = self.x[:count], self.y[:count]
+        speed_x, speed_y = self.speed_x[:count], self.speed_y[:count]
+        rect_x, rect_y = self.rect_x[:count], self.rect_y[:count]
+
+        # Keep every speed at BALL_SPEED * multiplier, which Ball does with normalize_speed()
+        speed = np.hypot(speed_x, speed_y)
+        moving = speed != 0
+        scale = BALL_SPEED * self.game.speed_scale * self.speed_multiplier[:count][moving] / speed[moving]
+        speed_x[moving] *= scale
+        speed_y[moving] *= scale
+
+        self.prev_x[:count] = rect_x
+        self.prev_y[:count] = rect_y
+        x += speed_x
+        y += speed_y
+        np.rint(x, out=rect_x, casting='unsafe')  # Rounds half to even like round()
+        np.rint(y, out=rect_y, casting='unsafe')
+
+        left = rect_x <= 0
+        speed_x[left] = np.abs(speed_x[left])
+        x[left] = rect_x[left] + 1
+        right = rect_x + self.size >= SCREEN_WIDTH
+        speed_x[right] = -np.abs(speed_x[right])
+        x[right] = rect_x[right] - 1
+        top = rect_y <= 0
+        speed_y[top] = np.abs(speed_y[top])
+        y[top] = rect_y[top] + 1
+
+        bounces = int(left.sum() + right.sum() + top.sum())
+        if bounces:
+            logging.debug(f"{bounces} balls bounced off the walls.")
+            self.game.play_sound('wall')  # One sound per tick however many balls bounced
+
+    def contact_candidates(self, paddle_rect, bricks):
+        """Handles for the balls that overlap the paddle or a live brick cell."""
+        count = self.count
+        rect_x, rect_y = self.rect_x[:count], self.rect_y[:count]
+        size = self.size
+        candidates = ((rect_x < paddle_rect.right) & (rect_x + size > paddle_rect.left)
+                      & (rect_y < paddle_rect.bottom) & (rect_y + size > paddle_rect.top))
+        candidates |= bricks.touching(rect_x, rect_y, size, size)
+        candidates &= self.alive[:count]
+        return [BatchBall(self, index) for index in np.flatnonzero(candidates).tolist()]
+
+    def cull_out_of_bounds(self):
+        """Kill every ball below the screen and return how many were lost."""
+        count = self.count
+        lost = self.alive[:count] & (self.rect_y[:count] > SCREEN_HEIGHT)
+        lost_count = int(lost.sum())
+        if lost_count:
+            self.alive[:count][lost] = False
+            self.alive_count -= lost_count
+        return lost_count
+
+    # ---------------------- Rendering ----------------------
+    def blit_list(self, alpha=1.0):
+        """(image, position) of every live ball, alpha of the way from its previous tick's position to its current one."""
+        if self.images is None:
+            self.images = [sprite_image('ball', (self.size, self.size), color) for color in (WHITE, EXPLOSIVE_BALL_COLOR)]
+        live = np.flatnonzero(self.alive[:self.count])
+        xs, ys = self.rect_x[live], self.rect_y[live]
+        if alpha < 1.0:
+            prev_x, prev_y = self.prev_x[live], self.prev_y[live]
+            jumped = (np.abs(xs - prev_x) > INTERPOLATION_SNAP) | (np.abs(ys - prev_y) > INTERPOLATION_SNAP)
+            xs = np.where(jumped, xs, np.rint(prev_x + (xs - prev_x) * alpha)).astype(np.int64)
+            ys = np.where(jumped, ys, np.rint(prev_y + (ys - prev_y) * alpha)).astype(np.int64)
+        images = self.images
+        return [(images[explosive], position) for explosive, position in
+                zip(self.explosive[live].tolist(), zip(xs.tolist(), ys.tolist()))]
+
+# ========================== Game State ==========================
+class Game:
+    """All state and rules for one game of Breakout, advanced one tick at a time by step()."""
+
+    def __init__(self,
+                 headless=False,                   # No display, audio, fonts, explosions or messages
+                 high_score_file=HIGH_SCORE_FILE,  # None never reads or writes a high score
+                 use_brick_field=False,            # Boards in a BrickField instead of Brick sprites
+                 explosive_bricks=False,           # Destroyed bricks may explode their neighbours (breakout015)
+                 swept_collisions=False,           # Continuous collision detection; see sweep_ball()
+                 batched_balls=False,              # Balls in a BallBatch, with the discrete collision rules
+                 max_balls=MAX_BALLS,
+                 tick_rate=TICK_RATE,              # step() advances 1 / tick_rate s; speeds are scaled to match
+                 seed=None,                        # Seeds self.rng, which all gameplay randomness comes from
+                 rng=None):                        # Use this generator; without a seed the game can't be recorded
+        self.headless = headless
+        self.options = dict(use_brick_field=use_brick_field, explosive_bricks=explosive_bricks,
+                            swept_collisions=swept_collisions, batched_balls=batched_balls,
+                            max_balls=max_balls, tick_rate=tick_rate)
+        if rng is None:
+            self.seed = seed if seed is not None else random.randrange(2 ** 32)
+            self.rng = random.Random(self.seed)
+        else:
+            self.seed = seed  # The caller vouches that rng is in the state seed gives
+            self.rng = rng
+        self.recording = None
+        self.tick_rate = tick_rate
+        self.speed_scale = BASE_TICK_RATE / tick_rate  # Per-tick distances relative to BASE_TICK_RATE
+        self.high_score_file = high_score_file
+        self.use_brick_field = use_brick_field
+        self.explosive_bricks = explosive_bricks
+        self.swept_collisions = swept_collisions and not batched_balls
+        self.batched_balls = batched_balls
+        self.max_balls = max_balls
+        self.brick_field = None
+
+        # ---------------------- Sprite Groups ----------------------
+        self.all_sprites = pygame.sprite.Group()
+        self.bricks = pygame.sprite.Group()
+        self.all_powerups = pygame.sprite.Group()
+        self.balls = BallBatch(self) if batched_balls else pygame.sprite.Group()
+        self.lasers = pygame.sprite.Group()
+        self.messages = pygame.sprite.Group()
+        self.brick_grid = BrickGrid(0, 0)
+
+        self.high_score = load_high_score(high_score_file) if high_score_file else 0
+        self.current_level = 1
+        self.score = 0
+        self.lives = 3
+        self.game_over = False
+        self.win = False
+        self.level_start = True
+        self.paused = False
+        self.ticks = 0
+        self.prev_inputs = NO_INPUT
+        self.pickups = Counter()     # Power-up type -> times caught this game
+        self.lives_lost = Counter()  # Level -> lives lost on it this game
+        self.advanced = False        # Whether the last step() moved anything
+        self.render_positions = {}   # Sprite -> rect.topleft before the last step()
+        self.profiler = None         # FrameProfiler timing the phases of step()
+        self.sounds = None if headless else SoundDispatcher()
+
+        # Create Paddle
+        self.paddle = Paddle(self)
+        # Removed adding paddle to all_sprites
+
+    def play_sound(self, name):
+        if self.sounds is not None:
+            self.sounds.request(name)
+
+    def start_recording(self):
+        """Record the inputs of every following step() and reset(); returns the Recording."""
+        if self.ticks:
+            raise ValueError("Recordings must start before the first step().")
+        if self.seed is None:
+            raise ValueError("Games given an rng without a seed can't be recorded; pass the seed it was made from.")
+        self.recording = Recording(self.seed, self.options, self.high_score)
+        return self.recording
+
+    def seconds_to_ticks(self, seconds):
+        return max(1, round(seconds * self.tick_rate))
+
+    # ---------------------- Interpolation ----------------------
+    def capture_render_positions(self):
+        # Everything that moves between ticks, except BallBatch balls which keep their own prev_x/prev_y
+        moving = [self.paddle, *self.all_powerups, *self.lasers, *self.messages]
+        if not self.batched_balls:
+            moving.extend(self.balls)
+        self.render_positions = {sprite: sprite.rect.topleft for sprite in moving}
+
+    def render_position(self, sprite, alpha):
+        """Where to draw sprite alpha of the way from its previous tick's position to its current one."""
+        x, y = sprite.rect.topleft
+        previous = self.render_positions.get(sprite)
+        if previous is None or not self.advanced:
+            return x, y
+        prev_x, prev_y = previous
+        if abs(x - prev_x) > INTERPOLATION_SNAP or abs(y - prev_y) > INTERPOLATION_SNAP:
+            return x, y  # Teleported, e.g. re-centred after losing a life
+        return round(prev_x + (x - prev_x) * alpha), round(prev_y + (y - prev_y) * alpha)
+
+    def spawn_explosion(self, x, y):
+        if not self.headless:
+            Explosion(self, x, y)
+
+    def add_ball(self, x, y, speed_x=None, speed_y=-4, speed_increment=0):
+        if self.batched_balls:
+            # Ball's speed_increment is undone by its own normalize_speed(), so the batch skips it
+            return self.balls.spawn(x, y, speed_x=speed_x, speed_y=speed_y)
+        ball = Ball(self, x, y, speed_x=speed_x, speed_y=speed_y, speed_increment=speed_increment)
+        self.balls.add(ball)
+        self.all_sprites.add(ball)
+        return ball
+
+    # ---------------------- Brick Creation ----------------------
+    def create_bricks(self, rows, cols, level=1):
+        logging.info(f"Creating bricks: rows={rows}, cols={cols}, level={level}.")
+        padding = BRICK_PADDING
+        offset_x = (SCREEN_WIDTH - (cols * (BRICK_WIDTH + padding))) / 2
+        offset_y = 60
+        if self.use_brick_field:
+            self.brick_field = BrickField(self, rows, cols, offset_x, offset_y, background=level_background(level))
+            logging.info(f"{len(self.brick_field)} bricks created for level {level}.")
+            return
+        self.brick_grid = BrickGrid(rows, cols)
+        for row in range(rows):
+            for col in range(cols):
+                x = offset_x + col * (BRICK_WIDTH + padding)
+                y = offset_y + row * (BRICK_HEIGHT + padding)
+                # Simplified brick creation without explosive bricks
+                hits = 1
+                color = [RED, GREEN, YELLOW, ORANGE, PURPLE][row % 5]
+                brick = Brick(self, x, y, hits, color)
+                self.bricks.add(brick)
+                self.all_sprites.add(brick)
+                self.brick_grid.add(brick, row, col)
+        logging.info(f"{len(self.bricks)} bricks created for level {level}.")
+
+    @property
+    def brick_store(self):
+        """The BrickField or BrickGrid holding the current board."""
+        return self.brick_field if self.brick_field is not None else self.brick_grid
+
+    def explode_bricks(self, sources):
+        """Explode the neighbours of each source brick, chaining as in breakout015's Brick.explode."""
+        wave = sources
+        detonations = 0
+        while wave and detonations < MAX_CHAIN_EXPLOSIONS:
+            wave = wave[:MAX_CHAIN_EXPLOSIONS - detonations]
+            detonations += len(wave)
+            for brick in wave:
+                logging.info(f"Brick at ({brick.rect.x}, {brick.rect.y}) is exploding adjacent bricks.")
+                self.play_sound('explosion')
+                self.spawn_explosion(brick.rect.centerx, brick.rect.centery)
+            next_wave = []
+            for brick in self.brick_store.adjacent(wave, EXPLOSION_REACH):
+                brick.kill()
+                logging.debug(f"Adjacent brick at ({brick.rect.x}, {brick.rect.y}) destroyed by explosion.")
+                self.play_sound('brick')
+                # 20% chance to drop a power-up from each destroyed adjacent brick
+                if self.rng.random() < 0.2:
+                    powerup = PowerUp(brick.rect.centerx, brick.rect.centery, speed_scale=self.speed_scale, rng=self.rng)
+                    self.all_powerups.add(powerup)
+                    self.all_sprites.add(powerup)
+                    logging.debug("Power-up dropped by exploded adjacent brick.")
+                if self.rng.random() < EXPLOSIVE_BRICK_CHANCE:
+                    logging.debug("Adjacent brick is also explosive. Triggering further explosion.")
+                    next_wave.append(brick)
+            wave = next_wave
+        if wave:
+            logging.debug(f"Chain explosion stopped after {detonations} detonations.")
+
+    # ---------------------- Game Management ----------------------
+    def clear_active_powerups(self):
+        logging.debug("Clearing all active power-ups.")
+        # Deactivate paddle power-ups
+        for power in list(self.paddle.active_powerups.keys()):
+            self.paddle.deactivate_powerup(power)
+        # Deactivate ball power-ups
+        for ball in self.balls:
+            if ball.explosive:
+                ball.revert_to_regular()
+
+    def apply_powerup(self, power_type):
+        logging.debug(f"Applying power-up: {power_type}.")
+        instant_powerups = ['extra_life', 'multi_ball']
+        if power_type not in instant_powerups:
+            self.clear_active_powerups()
+        if power_type == 'expand_paddle':
+            self.paddle.activate_powerup('expand_paddle')
+        elif power_type == 'extra_life':
+            self.lives += 1
+            logging.info(f"Extra life granted. Lives: {self.lives}.")
+        elif power_type == 'multi_ball':
+            if len(self.balls) >= self.max_balls:
+                logging.warning("Maximum number of balls reached. Multi-ball power-up not applied.")
+                return
+            ball = self.rng.choice(list(self.balls))
+            angle = math.atan2(ball.speed_y, ball.speed_x)
+            speed_variation = math.radians(15)
+            speed = math.hypot(ball.speed_x, ball.speed_y)
+            new_angle1 = angle + speed_variation
+            new_angle2 = angle - speed_variation
+            new_speed_x1 = speed * math.cos(new_angle1)
+            new_speed_y1 = speed * math.sin(new_angle1)
+            new_speed_x2 = speed * math.cos(new_angle2)
+            new_speed_y2 = speed * math.sin(new_angle2)
+            self.add_ball(ball.x, ball.y, speed_x=new_speed_x1, speed_y=new_speed_y1)
+            self.add_ball(ball.x, ball.y, speed_x=new_speed_x2, speed_y=new_speed_y2)
+            logging.debug("Multi-ball power-up applied: two new balls created.")
+            logging.info(f"Total balls after multi-ball power-up: {len(self.balls)}.")
+        elif power_type == 'shrink_paddle':
+            self.paddle.activate_powerup('shrink_paddle')
+        elif power_type == 'slow_ball':
+            for ball in self.balls:
+                ball.apply_slow()
+        elif power_type == 'laser_paddle':
+            self.paddle.activate_powerup('laser_paddle')
+        elif power_type == 'explosive_ball':
+            # Make all existing balls explosive
+            for ball in self.balls:
+                ball.make_explosive()
+        else:
+            logging.warning(f"Unknown power-up type: {power_type}.")
+
+    def reset(self):
+        logging.info("Resetting game.")
+        if self.recording is not None:
+            self.recording.record_reset()
+        self.score = 0
+        self.lives = 3
+        self.game_over = False
+        self.win = False
+        self.current_level = 1
+        self.level_start = True
+        self.pickups.clear()
+        self.lives_lost.clear()
+
+        # Clear all sprite groups except paddle
+        self.bricks.empty()
+        self.brick_grid.clear()
+        self.brick_field = None
+        self.all_powerups.empty()
+        self.lasers.empty()
+        self.messages.empty()
+        self.all_sprites.empty()
+        self.balls.empty()
+
+        # Recreate Paddle
+        self.paddle = Paddle(self)
+        # Removed adding paddle to all_sprites
+
+    def start_level(self):
+        self.level_start = False
+        logging.info(f"Starting level {self.current_level}.")
+        self.clear_active_powerups()
+        self.create_bricks(5 + self.current_level, 10, self.current_level)
+        # Reset balls
+        for ball in self.balls.copy():
+            ball.kill()
+        self.add_ball(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, speed_increment=0.1 * self.current_level)
+        logging.debug("New ball created for the new level.")
+        # Center the paddle at the start of the level
+        self.paddle.center_paddle()
+
+    # ---------------------- Collision Handling ----------------------
+    def collide_ball_discrete(self, ball):
+        """Resolve a ball that has already moved a whole step by rect overlap with the paddle and bricks."""
+        paddle = self.paddle
         ball.collided = False  # Reset collision flag at the start of handling
 
         # Collision with paddle
@@ -664,20 +1782,9 @@ def handle_collisions():
                     ball.rect.bottom = paddle.rect.top
                     ball.speed_y = -abs(ball.speed_y)
                     ball.y = float(ball.rect.y)
-                    hit_pos = (ball.rect.centerx - paddle.rect.left) / paddle.width
-                    hit_pos = hit_pos * 2 - 1
-                    max_speed_x = BALL_SPEED * 0.8
-                    ball.speed_x = hit_pos * max_speed_x
-
-                    if paddle.moving_left:
-                        ball.speed_x -= 1
-                    elif paddle.moving_right:
-                        ball.speed_x += 1
-
-                    ball.speed_x = max(-BALL_SPEED, min(ball.speed_x, BALL_SPEED))
-                    ball.normalize_speed()
+                    hit_pos = self.deflect_off_paddle(ball)
                     ball.y = float(ball.rect.y)
-                    SOUND_EFFECTS['paddle'].play()
+                    self.play_sound('paddle')
 
                     angle_after_paddle = calculate_angle(ball.speed_x, ball.speed_y)
                     logging.info(f"Ball bounced off Paddle. Angle changed from {angle_before_paddle}° to {angle_after_paddle}°.")
@@ -686,7 +1793,7 @@ def handle_collisions():
                     ball.collided = True  # Set collision flag
 
         # Collision with bricks
-        hit_bricks = pygame.sprite.spritecollide(ball, bricks, False)
+        hit_bricks = self.brick_store.collide(ball.rect)
         if hit_bricks and not ball.collided:
             # Process only the first collision to prevent multiple bounces
             brick = hit_bricks[0]
@@ -716,8 +1823,8 @@ def handle_collisions():
             ball.y = float(ball.rect.y)
 
             brick.hit()
-            score += 10
-            logging.info(f"Score increased to {score}.")
+            self.score += 10
+            logging.info(f"Score increased to {self.score}.")
             ball.normalize_speed()
 
             angle_after_brick = calculate_angle(ball.speed_x, ball.speed_y)
@@ -728,118 +1835,1011 @@ def handle_collisions():
 
             # Check if the ball is explosive
             if ball.explosive:
-                # Create an explosion at the collision point
-                Explosion(ball.rect.centerx, ball.rect.centery)
-                # Destroy bricks within the explosion radius (100 pixels)
-                explosion_radius = 100
-                for other_brick in bricks.copy():
-                    distance = math.hypot(other_brick.rect.centerx - ball.rect.centerx,
-                                          other_brick.rect.centery - ball.rect.centery)
-                    if distance <= explosion_radius:
-                        other_brick.kill()
-                        score += 10
-                        logging.info(f"Brick at ({other_brick.rect.x}, {other_brick.rect.y}) destroyed by explosion. Score: {score}.")
-                # Revert the ball to regular state
-                ball.revert_to_regular()
+                self.detonate(ball)
+
+    def sweep_ball(self, ball):
+        """Move a ball along this tick's path, resolving contacts in time-of-impact order."""
+        paddle = self.paddle
+        size = ball.radius * 2
+        ball.prev_rect = ball.rect.copy()
+        remaining = 1.0
+
+        for bounce in range(MAX_BOUNCES_PER_TICK):
+            dx = ball.speed_x * remaining
+            dy = ball.speed_y * remaining
+            contact_time, contact_axis, contact = 1.0, None, None
+
+            # Walls (the bottom of the screen is open)
+            if dx < 0 and ball.x + dx < 0:
+                contact_time, contact_axis, contact = max(-ball.x / dx, 0.0), 'x', 'left wall'
+            elif dx > 0 and ball.x + size + dx > SCREEN_WIDTH:
+                contact_time, contact_axis, contact = max((SCREEN_WIDTH - size - ball.x) / dx, 0.0), 'x', 'right wall'
+            if dy < 0 and ball.y + dy < 0 and max(-ball.y / dy, 0.0) < contact_time:
+                contact_time, contact_axis, contact = max(-ball.y / dy, 0.0), 'y', 'top wall'
+
+            # Paddle, only from above as in the discrete check
+            if ball.speed_y > 0 and ball.y + size <= paddle.rect.top:
+                impact = sweep_rect(ball.x, ball.y, size, size, dx, dy, paddle.rect)
+                if impact and impact[1] == 'y' and impact[0] < contact_time:
+                    contact_time, contact_axis, contact = impact[0], 'y', paddle
+
+            # Bricks under the rect swept over the rest of the step
+            path = pygame.Rect(math.floor(min(ball.x, ball.x + dx)), math.floor(min(ball.y, ball.y + dy)),
+                               math.ceil(abs(dx)) + size + 1, math.ceil(abs(dy)) + size + 1)
+            for brick in self.brick_store.collide(path):
+                impact = sweep_rect(ball.x, ball.y, size, size, dx, dy, brick.rect)
+                if impact and impact[0] < contact_time:
+                    contact_time, contact_axis, contact = impact[0], impact[1], brick
+
+            ball.x += dx * contact_time
+            ball.y += dy * contact_time
+            remaining *= 1.0 - contact_time
+            if contact is None:
+                break
+
+            if contact is paddle:
+                self.bounce_off_paddle(ball)
+            elif isinstance(contact, str):
+                self.bounce_off_wall(ball, contact)
+            else:
+                self.bounce_off_brick(ball, contact, contact_axis)
+        else:
+            if remaining > 0:
+                logging.debug(f"Ball stopped after {MAX_BOUNCES_PER_TICK} bounces in one tick.")
+
+        ball.rect.x = round(ball.x)
+        ball.rect.y = round(ball.y)
+
+    def bounce_off_wall(self, ball, wall):
+        logging.info(f"Ball collided with the {wall}.")
+        self.play_sound('wall')
+        if wall == 'left wall':
+            ball.x = 0.0
+            ball.speed_x = abs(ball.speed_x)
+        elif wall == 'right wall':
+            ball.x = float(SCREEN_WIDTH - ball.radius * 2)
+            ball.speed_x = -abs(ball.speed_x)
+        else:
+            ball.y = 0.0
+            ball.speed_y = abs(ball.speed_y)
+        ball.normalize_speed()
+        logging.info(f"Ball bounced off {wall}. New speed: ({ball.speed_x:.2f}, {ball.speed_y:.2f}).")
+
+    def bounce_off_paddle(self, ball):
+        logging.info("Ball collided with Paddle.")
+        angle_before_paddle = calculate_angle(ball.speed_x, ball.speed_y)
+        ball.y = float(self.paddle.rect.top - ball.radius * 2)
+        ball.speed_y = -abs(ball.speed_y)
+        ball.rect.x = round(ball.x)
+        ball.rect.y = round(ball.y)
+        hit_pos = self.deflect_off_paddle(ball)
+        self.play_sound('paddle')
+        angle_after_paddle = calculate_angle(ball.speed_x, ball.speed_y)
+        logging.info(f"Ball bounced off Paddle. Angle changed from {angle_before_paddle}° to {angle_after_paddle}°.")
+        logging.info(f"Ball bounced at position {round(hit_pos, 2)} on the Paddle.")
+
+    def bounce_off_brick(self, ball, brick, axis):
+        logging.info(f"Ball collided with Brick at ({brick.rect.x}, {brick.rect.y}).")
+        angle_before_brick = calculate_angle(ball.speed_x, ball.speed_y)
+        size = ball.radius * 2
+        # Snap to the face that was hit so the next sweep starts exactly in contact
+        if axis == 'x':
+            if ball.speed_x > 0:
+                ball.x = float(brick.rect.left - size)
+                ball.speed_x = -abs(ball.speed_x)
+            else:
+                ball.x = float(brick.rect.right)
+                ball.speed_x = abs(ball.speed_x)
+        else:
+            if ball.speed_y > 0:
+                ball.y = float(brick.rect.top - size)
+                ball.speed_y = -abs(ball.speed_y)
+            else:
+                ball.y = float(brick.rect.bottom)
+                ball.speed_y = abs(ball.speed_y)
+        ball.rect.x = round(ball.x)
+        ball.rect.y = round(ball.y)
+
+        brick.hit()
+        self.score += 10
+        logging.info(f"Score increased to {self.score}.")
+        ball.normalize_speed()
+
+        angle_after_brick = calculate_angle(ball.speed_x, ball.speed_y)
+        logging.info(f"Ball bounced off Brick. Angle changed from {angle_before_brick}° to {angle_after_brick}°.")
+
+        if ball.explosive:
+            self.detonate(ball)
+
+    def deflect_off_paddle(self, ball):
+        """Aim a ball leaving the paddle by where it hit and how the paddle is moving; returns the hit position."""
+        paddle = self.paddle
+        hit_pos = (ball.rect.centerx - paddle.rect.left) / paddle.width
+        hit_pos = hit_pos * 2 - 1
+        ball_speed = BALL_SPEED * self.speed_scale
+        max_speed_x = ball_speed * 0.8
+        ball.speed_x = hit_pos * max_speed_x
+
+        if paddle.moving_left:
+            ball.speed_x -= self.speed_scale
+        elif paddle.moving_right:
+            ball.speed_x += self.speed_scale
+
+        ball.speed_x = max(-ball_speed, min(ball.speed_x, ball_speed))
+        ball.normalize_speed()
+        return hit_pos
+
+    def detonate(self, ball):
+        # Create an explosion at the collision point
+        self.spawn_explosion(ball.rect.centerx, ball.rect.centery)
+        # Destroy bricks within the explosion radius (100 pixels)
+        for other_brick in self.brick_store.blast([ball.rect.centerx], [ball.rect.centery], BLAST_RADIUS):
+            other_brick.kill()
+            self.score += 10
+            logging.info(f"Brick at ({other_brick.rect.x}, {other_brick.rect.y}) destroyed by explosion. Score: {self.score}.")
+        # Revert the ball to regular state
+        ball.revert_to_regular()
+
+    def handle_collisions(self):
+        balls = self.balls
+
+        if self.batched_balls:
+            # Only balls already overlapping the paddle or a live brick need resolving one by one
+            for ball in balls.contact_candidates(self.paddle.rect, self.brick_store):
+                self.collide_ball_discrete(ball)
+            if balls:
+                return self.handle_world_collisions()
+            return None
+
+        for index, ball in enumerate(balls):
+            if self.swept_collisions:
+                self.sweep_ball(ball)
+            else:
+                self.collide_ball_discrete(ball)
+
+            level_completed = self.handle_world_collisions(lasers=index == 0)  # Lasers once a tick, with the first ball
+            if level_completed is not None:
+                return level_completed  # Indicate level completion
+
+    def handle_world_collisions(self, lasers=True):
+        """Power-ups, lasers (unless lasers=False), lost balls and the win check; None while bricks remain."""
+        paddle = self.paddle
+        balls = self.balls
+
+        level_completed = False  # Flag to indicate level completion
 
         # Collision with power-ups
-        collected_powerups = pygame.sprite.spritecollide(paddle, all_powerups, True)
+        collected_powerups = pygame.sprite.spritecollide(paddle, self.all_powerups, True)
         for power in collected_powerups:
             logging.info(f"Power-up '{power.power_type}' collected at ({power.rect.x}, {power.rect.y}).")
-            apply_powerup(power.power_type)
-            SOUND_EFFECTS['powerup'].play()
-
-            display_text = {
-                'expand_paddle': "Expanded Paddle!",
-                'extra_life': "Extra Life!",
-                'multi_ball': "Multi-Ball!",
-                'shrink_paddle': "Shrunk Paddle!",
-                'slow_ball': "Slowed Ball!",
-                'laser_paddle': "Laser Paddle!",
-                'explosive_ball': "Explosive Ball!"  # Added explosive_ball message
-            }.get(power.power_type, "Power-Up!")
-
-            if messages:
-                lowest_y = max(msg.rect.y for msg in messages)
-                new_y = lowest_y + 30
-                new_y = min(new_y, SCREEN_HEIGHT - 30)
-            else:
-                new_y = SCREEN_HEIGHT / 2 + 100
-
-            message_position = (SCREEN_WIDTH / 2, new_y)
-            message = PowerUpMessage(text=display_text, position=message_position)
-            logging.debug(f"Power-up message '{display_text}' displayed at position {message_position}.")
+            self.pickups[power.power_type] += 1
+            self.apply_powerup(power.power_type)
+            self.play_sound('powerup')
+            if not self.headless:
+                self.show_powerup_message(power.power_type)
 
         # Collision with lasers
-        laser_hits = pygame.sprite.groupcollide(lasers, bricks, True, False)
+        laser_hits = {}
+        in_flight = self.lasers.sprites() if lasers else []
+        for laser, hit_bricks in zip(in_flight, self.brick_store.laser_hits([(laser.rect, -laser.speed_y) for laser in in_flight])):
+            if hit_bricks:
+                laser.kill()
+                laser_hits[laser] = hit_bricks
+        hit_cells = set()  # A brick takes at most one laser a tick
         for laser, hit_bricks in laser_hits.items():
             for brick in hit_bricks:
+                if brick.grid_index in hit_cells:
+                    continue
+                hit_cells.add(brick.grid_index)
                 logging.info(f"Laser collided with Brick at ({brick.rect.x}, {brick.rect.y}).")
                 brick.hit()
-                score += 15
-                logging.info(f"Score increased to {score}.")
+                self.score += 15
+                logging.info(f"Score increased to {self.score}.")
 
         # Check for balls out of bounds
-        for ball in balls.copy():
-            if ball.rect.top > SCREEN_HEIGHT:
-                logging.info("Ball went out of bounds.")
-                ball.kill()
-                logging.debug(f"Ball removed. Remaining balls: {len(balls)}.")
+        if self.batched_balls:
+            lost = balls.cull_out_of_bounds()
+            if lost:
+                logging.info(f"{lost} balls went out of bounds. Remaining balls: {len(balls)}.")
                 if len(balls) == 0:
-                    lives -= 1
-                    logging.info(f"Lives decreased to {lives}.")
-                    if lives > 0:
-                        new_ball = Ball(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-                        balls.add(new_ball)
-                        all_sprites.add(new_ball)
-                        logging.debug("New ball created after losing a life.")
-                        # Center the paddle when a new ball is created
-                        paddle.center_paddle()
-                    else:
-                        game_over = True
-                        SOUND_EFFECTS['game_over'].play()
-                        logging.info("Game Over triggered.")
+                    self.lose_life()
+        else:
+            for ball in balls.copy():
+                if ball.rect.top > SCREEN_HEIGHT:
+                    logging.info("Ball went out of bounds.")
+                    ball.kill()
+                    logging.debug(f"Ball removed. Remaining balls: {len(balls)}.")
+                    if len(balls) == 0:
+                        self.lose_life()
 
         # Check for win
-        if len(bricks) == 0:
+        if len(self.brick_store) == 0:
             logging.info("All bricks destroyed. Level completed.")
-            score += 100
-            logging.info(f"Score increased by 100 to {score}.")
-            if score > high_score:
-                high_score = score
-                save_high_score(high_score)
+            self.score += 100
+            logging.info(f"Score increased by 100 to {self.score}.")
+            if self.score > self.high_score:
+                self.high_score = self.score
+                if self.high_score_file:
+                    save_high_score(self.high_score, self.high_score_file)
                 logging.info("New high score achieved!")
-            if current_level < max_levels:
+            if self.current_level < max_levels:
                 level_completed = True
             else:
-                win = True
-                game_over = True
+                self.win = True
+                self.game_over = True
                 logging.info("Player has won the game!")
 
-            return level_completed  # Indicate level completion
+            return level_completed
+        return None
+
+    def lose_life(self):
+        self.lives -= 1
+        self.lives_lost[self.current_level] += 1
+        logging.info(f"Lives decreased to {self.lives}.")
+        if self.lives > 0:
+            self.add_ball(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+            logging.debug("New ball created after losing a life.")
+            # Center the paddle when a new ball is created
+            self.paddle.center_paddle()
+        else:
+            self.game_over = True
+            self.play_sound('game_over')
+            logging.info("Game Over triggered.")
+
+    def show_powerup_message(self, power_type):
+        display_text = POWERUP_CAPTIONS.get(power_type, DEFAULT_POWERUP_CAPTION)
+
+        if self.messages:
+            lowest_y = max(msg.rect.y for msg in self.messages)
+            new_y = lowest_y + 30
+            new_y = min(new_y, SCREEN_HEIGHT - 30)
+        else:
+            new_y = SCREEN_HEIGHT / 2 + 100
+
+        message_position = (SCREEN_WIDTH / 2, new_y)
+        PowerUpMessage(self, text=display_text, position=message_position)
+        logging.debug(f"Power-up message '{display_text}' displayed at position {message_position}.")
+
+    # ---------------------- Simulation Step ----------------------
+    def step(self, inputs=NO_INPUT):
+        """Advance the game by one tick using the held control state in inputs."""
+        self.ticks += 1
+        if self.recording is not None:
+            self.recording.record(inputs)
+        prev_inputs = self.prev_inputs
+        self.prev_inputs = inputs
+        self.advanced = False
+        if not self.headless:
+            self.capture_render_positions()
+
+        if inputs.pause and not prev_inputs.pause:
+            self.paused = not self.paused
+            logging.info(f"Game {'paused' if self.paused else 'resumed'} by user.")
+        if inputs.space and not prev_inputs.space and 'laser_paddle' in self.paddle.active_powerups:
+            self.paddle.shoot_laser()
+
+        # Level Start
+        if self.level_start:
+            if inputs.space:
+                self.start_level()
+        elif not self.game_over:
+            if not self.paused:
+                self.advanced = True
+                profiler = self.profiler
+                if profiler is not None:
+                    profiler.mark('step')
+                self.paddle.update(inputs.left, inputs.right)
+                if profiler is not None:
+                    profiler.mark('paddle')
+                self.all_sprites.update()
+                if self.batched_balls:
+                    self.balls.update()
+                self.messages.update()
+                if profiler is not None:
+                    profiler.mark('sprites')
+                collision_result = self.handle_collisions()  # Call once and store the result
+                if profiler is not None:
+                    profiler.mark('collisions')
+                if collision_result:
+                    self.level_start = True
+                    if self.current_level < max_levels:
+                        self.current_level += 1
+                        logging.info(f"Proceeding to level {self.current_level}.")
+                    else:
+                        self.win = True
+                        self.game_over = True
+                        logging.info("All levels completed. Player wins!")
+
+        if self.sounds is not None:
+            self.sounds.flush()
+
+# ========================== Input Recording ==========================
+RECORDING_VERSION = 1
+RESET_EVENT = -1  # Marks a Game.reset() in a recording's input runs
+
+class Recording:
+    """The seed, options and run-length encoded per-tick inputs of one game."""
+
+    def __init__(self, seed, options=None, high_score=0, runs=None):
+        self.seed = seed
+        self.options = dict(options or {})
+        self.high_score = high_score
+        self.runs = runs if runs is not None else []
+
+    def __len__(self):
+        return sum(count for bits, count in self.runs if bits != RESET_EVENT)
+
+    def record(self, inputs):
+        bits = 0
+        for bit, held in enumerate(inputs):
+            if held:
+                bits |= 1 << bit
+        if self.runs and self.runs[-1][0] == bits:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+
+    def record_reset(self):
+        self.runs.append([RESET_EVENT, 1])
+
+    def events(self):
+        """Yield the Inputs for each tick in order, and None for each reset."""
+        for bits, count in self.runs:
+            if bits == RESET_EVENT:
+                yield None
+                continue
+            inputs = Inputs(*(bool(bits >> bit & 1) for bit in range(len(Inputs._fields))))
+            for _ in range(count):
+                yield inputs
+
+    def create_game(self, **kwargs):
+        kwargs.setdefault('headless', True)
+        kwargs.setdefault('high_score_file', None)
+        game = Game(seed=self.seed, **self.options, **kwargs)
+        game.high_score = self.high_score
+        return game
+
+    def replay(self, game=None):
+        """Play the recording into game (a new headless Game by default) and return the game."""
+        if game is None:
+            game = self.create_game()
+        for inputs in self.events():
+            if inputs is None:
+                game.reset()
+            else:
+                game.step(inputs)
+        return game
+
+    def save(self, path):
+        with open(path, 'w') as file:
+            json.dump({'version': RECORDING_VERSION, 'seed': self.seed, 'options': self.options,
+                       'high_score': self.high_score, 'runs': self.runs}, file)
+        logging.info(f"Recording of {len(self)} ticks saved to {path}.")
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            data = json.load(file)
+        if data.get('version') != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {data.get('version')} in {path}.")
+        return cls(data['seed'], data['options'], data['high_score'], data['runs'])
+
+# ========================== Vector Environment ==========================
+# Discrete actions, gym style: an index into ENV_ACTIONS per game
+ENV_ACTIONS = (NO_INPUT, Inputs(left=True), Inputs(right=True), Inputs(space=True),
+               Inputs(left=True, space=True), Inputs(right=True, space=True))
+ENV_TIMED_POWERUPS = ('expand_paddle', 'shrink_paddle', 'laser_paddle')  # The power-ups with a timer
+ENV_BALL_FIELDS = ('x', 'y', 'speed_x', 'speed_y', 'slow', 'explosive')
+ENV_MAX_DROPS = 8                   # Falling power-ups reported per game
+ENV_BRICK_ROWS = 5 + max_levels     # Rows on the last level's board
+ENV_BRICK_COLS = 10
+
+class VectorEnv:
+    """N independent headless Games stepped as one batch, gym vector-env style."""
+
+    def __init__(self, num_envs, seed=None, max_episode_ticks=None, auto_start=True, use_brick_field=True, **game_options):
+        self.num_envs = num_envs
+        self.max_episode_ticks = max_episode_ticks
+        self.auto_start = auto_start
+        self.game_options = dict(game_options, use_brick_field=use_brick_field)
+        self.games = []
+        self.episode_ticks = np.zeros(num_envs, dtype=np.int64)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start N new games, seeded seed, seed + 1, ... if seed is given; returns (observations, infos)."""
+        seeds = [None] * self.num_envs if seed is None else [seed + i for i in range(self.num_envs)]
+        self.games = [Game(headless=True, high_score_file=None, seed=game_seed, **self.game_options)
+                      for game_seed in seeds]
+        self.episode_ticks[:] = 0
+        return self.observe(), {'seed': np.array([game.seed for game in self.games], dtype=np.int64)}
+
+    def step(self, actions):
+        actions = np.asarray(actions).tolist()
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}.")
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        scores = np.zeros(self.num_envs, dtype=np.int64)
+        # Gym style: the last observation of each episode that ended, and which entries hold one
+        final_observations = np.full(self.num_envs, None, dtype=object)
+        self.episode_ticks += 1
+        for i, (game, action) in enumerate(zip(self.games, actions)):
+            inputs = ENV_ACTIONS[action]
+            if self.auto_start and game.level_start:
+                inputs = inputs._replace(space=True)
+            score = game.score
+            game.step(inputs)
+            rewards[i] = game.score - score
+            scores[i] = game.score
+            terminated[i] = game.game_over
+            truncated[i] = self.max_episode_ticks is not None and self.episode_ticks[i] >= self.max_episode_ticks
+            if terminated[i] or truncated[i]:
+                # Reset in the same step, so the observation is the start of the next episode
+                final_observations[i] = {key: value[0] for key, value in self.observe([game]).items()}
+                game.reset()
+                self.episode_ticks[i] = 0
+        infos = {'score': scores, 'final_observation': final_observations, '_final_observation': terminated | truncated}
+        return self.observe(), rewards, terminated, truncated, infos
+
+    def observe(self, games=None):
+        """A dict of NumPy arrays with a row per game (all of them by default); ball x/y are its left/top edge."""
+        games = self.games if games is None else games
+        n = len(games)
+        max_balls = games[0].max_balls if games else MAX_BALLS
+        paddle = np.zeros((n, 2), dtype=np.float32)                              # Centre x and width
+        balls = np.zeros((n, max_balls, len(ENV_BALL_FIELDS)), dtype=np.float32)  # ENV_BALL_FIELDS per ball
+        ball_mask = np.zeros((n, max_balls), dtype=bool)                         # Which rows of balls are in play
+        bricks = np.zeros((n, ENV_BRICK_ROWS, ENV_BRICK_COLS), dtype=bool)       # Brick-alive bitmap
+        powerups = np.zeros((n, len(ENV_TIMED_POWERUPS)), dtype=np.float32)      # Seconds left on each
+        drops = np.zeros((n, ENV_MAX_DROPS, 3), dtype=np.float32)  # x, y, POWERUP_TYPES index + 1 of falling power-ups
+        lives = np.zeros(n, dtype=np.int32)
+        level = np.zeros(n, dtype=np.int32)
+        for i, game in enumerate(games):
+            paddle[i] = game.paddle.rect.centerx, game.paddle.width
+            for j, ball in enumerate(game.balls):
+                if j == max_balls:
+                    break
+                balls[i, j] = ball.x, ball.y, ball.speed_x, ball.speed_y, ball.slow_effect, ball.explosive
+                ball_mask[i, j] = True
+            store = game.brick_store
+            rows, cols = min(store.rows, ENV_BRICK_ROWS), min(store.cols, ENV_BRICK_COLS)
+            bricks[i, :rows, :cols] = store.alive.reshape(store.rows, store.cols)[:rows, :cols]
+            active = game.paddle.active_powerups
+            for j, name in enumerate(ENV_TIMED_POWERUPS):
+                if name in active:
+                    powerups[i, j] = active[name] / game.tick_rate
+            for j, powerup in enumerate(game.all_powerups):
+                if j == ENV_MAX_DROPS:
+                    break
+                drops[i, j] = powerup.rect.centerx, powerup.rect.centery, POWERUP_TYPES.index(powerup.power_type) + 1
+            lives[i] = game.lives
+            level[i] = game.current_level
+        return {'paddle': paddle, 'balls': balls, 'ball_mask': ball_mask, 'bricks': bricks,
+                'powerups': powerups, 'drops': drops, 'lives': lives, 'level': level}
+
+# ========================== Autopilot ==========================
+AUTOPILOT_MAX_HIT_POS = 0.8  # Aim no closer than this to the paddle's ends (hit_pos runs from -1 to 1)
+
+def fold_wall_reflections(x, low, high):
+    """Where a point that moved freely to x ends up between reflecting walls at low and high."""
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (x - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+def follow_policy(game):
+    """Simple bot: start every level and keep the paddle under the lowest falling ball."""
+    if game.level_start:
+        return Inputs(space=True)
+    falling = [ball for ball in game.balls if ball.speed_y > 0]
+    if not falling:
+        return NO_INPUT
+    target = max(falling, key=lambda ball: ball.rect.bottom).rect.centerx
+    paddle_x = game.paddle.rect.centerx
+    return Inputs(left=target < paddle_x - 10, right=target > paddle_x + 10)
+
+class Autopilot:
+    """Analytic paddle controller; call it with a Game to get the next tick's Inputs."""
+
+    def __init__(self):
+        self.aim_key = None
+        self.targets = []  # (x, bottom) of each column's lowest live brick
+        self.fire = False
+        self.push = 0      # Direction to be moving in at contact, -1, 0 or 1
+
+    def __call__(self, game):
+        if game.level_start:
+            return Inputs(space=True)
+        paddle = game.paddle
+        self.fire = not self.fire and 'laser_paddle' in paddle.active_powerups
+        offset = self.target_x(game, paddle) - paddle.rect.centerx
+        if self.push:
+            return Inputs(left=self.push < 0, right=self.push > 0, space=self.fire)
+        step = paddle.speed * game.speed_scale / 2
+        return Inputs(left=offset < -step, right=offset > step, space=self.fire)
+
+    def target_x(self, game, paddle):
+        """The paddle centre x to head for."""
+        top = paddle.rect.top
+        self.push = 0
+        ball_ticks = None
+        for ball in game.balls:
+            speed_y = ball.speed_y
+            if speed_y <= 0:
+                continue
+            ticks = (top - ball.y - 2 * BALL_RADIUS) / speed_y
+            if ticks >= 0 and (ball_ticks is None or ticks < ball_ticks):
+                ball_ticks, landing_ball = ticks, ball
+        if ball_ticks is None:
+            # Nothing is coming down; wait under the lowest ball
+            lowest = max(game.balls, key=lambda ball: ball.y, default=None)
+            return lowest.x + BALL_RADIUS if lowest is not None else SCREEN_WIDTH / 2
+
+        land = fold_wall_reflections(landing_ball.x + BALL_RADIUS + landing_ball.speed_x * ball_ticks,
+                                     BALL_RADIUS, SCREEN_WIDTH - BALL_RADIUS)
+        # deflect_off_paddle() sets speed_x = hit_pos * 0.8 * ball speed
+        aim_x, aim_y = self.aim_point(game, land)
+        dx = aim_x - land
+        hit_pos = dx / math.hypot(dx, top - aim_y) / 0.8
+        hit_pos = max(-AUTOPILOT_MAX_HIT_POS, min(hit_pos, AUTOPILOT_MAX_HIT_POS))
+        half_width = paddle.width / 2
+        aimed = land - hit_pos * half_width
+
+        # Get as close to the aimed spot as the paddle can in time, keeping the ball on the paddle
+        reach = paddle.speed * game.speed_scale * ball_ticks
+        center = paddle.rect.centerx
+        low = max(land - AUTOPILOT_MAX_HIT_POS * half_width, center - reach, half_width)
+        high = min(land + AUTOPILOT_MAX_HIT_POS * half_width, center + reach, SCREEN_WIDTH - half_width)
+        if low > high:
+            return land
+        target = max(low, min(aimed, high))
+        if ball_ticks < 1 and abs(target - aimed) > 1:
+            # Can't line up the shot (often against a wall); moving at contact still bends it
+            self.push = 1 if dx > 0 else -1
+        return target
+
+    def aim_point(self, game, land):
+        """The bottom centre of the exposed brick (lowest live brick in its column) nearest to land."""
+        store = game.brick_store
+        key = (store, len(store))
+        if key != self.aim_key:
+            # Recomputed only when a brick goes
+            self.aim_key = key
+            self.targets = []
+            if len(store) and store.origin is not None:
+                board = store.alive.reshape(store.rows, store.cols)
+                cols = np.flatnonzero(board.any(axis=0))
+                rows = store.rows - 1 - np.argmax(board[::-1, cols], axis=0)
+                origin_x, origin_y = store.origin
+                self.targets = list(zip((origin_x + cols * store.cell_width + store.brick_width / 2).tolist(),
+                                        (origin_y + rows * store.cell_height + store.brick_height).tolist()))
+        if not self.targets:
+            return SCREEN_WIDTH / 2, 0
+        return min(self.targets, key=lambda target: abs(target[0] - land))
+
+def set_volume(new_volume):
+    global VOLUME
+    VOLUME = new_volume
+    for sound in SOUND_EFFECTS.values():
+        sound.set_volume(VOLUME)
+    logging.debug(f"Volume set to {VOLUME * 100}%.")
+
+def level_background(level):
+    level_colors = [
+        BLACK,
+        (10, 10, 50),
+        (50, 10, 10),
+        (10, 50, 10),
+        (50, 50, 10),
+        (10, 50, 50)
+    ]
+    return level_colors[level % len(level_colors)]
+
+def change_background(surface, level):
+    surface.fill(level_background(level))
+
+# ========================== Drawing ==========================
+HUD_CACHE_SIZE = 64  # Rendered text surfaces kept by the HUD
+
+class GlyphAtlas:
+    """Pre-rendered glyphs for a small character set, such as the digits."""
+
+    def __init__(self, font, color, characters='0123456789'):
+        self.glyphs = {character: font.render(character, True, color) for character in characters}
+
+    def size(self, text):
+        glyphs = self.glyphs
+        return sum(glyphs[character].get_width() for character in text), max(glyph.get_height() for glyph in glyphs.values())
+
+    def draw(self, surface, text, position):
+        x, y = position
+        blits = []
+        for character in text:
+            glyph = self.glyphs[character]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(position, self.size(text))
+
+class Hud:
+    """Cached text for the HUD readouts and the banners."""
+
+    def __init__(self, font, color=WHITE):
+        self.font = font
+        self.color = color
+        self.digits = GlyphAtlas(font, color, '0123456789-')
+        self.cache = {}
+        self.readouts = {}  # label -> (value, rendered readout)
+
+    def text(self, text, font, color):
+        key = (text, font, color)
+        surface = self.cache.get(key)
+        if surface is None:
+            if len(self.cache) >= HUD_CACHE_SIZE:
+                self.cache.clear()
+            surface = self.cache[key] = font.render(text, True, color)
+        return surface
+
+    def draw_text(self, text, font, color, surface, x, y):
+        """Cached equivalent of draw_text()."""
+        text_obj = self.text(text, font, color)
+        return surface.blit(text_obj, text_obj.get_rect(center=(x, y)))
+
+    def readout(self, label, value, suffix=''):
+        """One surface of label, the integer value and suffix, e.g. "Volume: " 50 "%"; rebuilt only when value changes."""
+        cached_value, readout = self.readouts.get(label, (None, None))
+        if readout is None or cached_value != value:
+            readout = self.compose(label, str(value), suffix)
+            self.readouts[label] = (value, readout)
+        return readout
+
+    def compose(self, label, digits, suffix):
+        label_surface = self.text(label, self.font, self.color)
+        suffix_surface = self.text(suffix, self.font, self.color) if suffix else None
+        digits_width, digits_height = self.digits.size(digits)
+        width = label_surface.get_width() + digits_width + (suffix_surface.get_width() if suffix else 0)
+        height = max(label_surface.get_height(), digits_height)
+        readout = pygame.Surface((width, height), pygame.SRCALPHA)
+        readout.blit(label_surface, (0, 0))
+        self.digits.draw(readout, digits, (label_surface.get_width(), 0))
+        if suffix:
+            readout.blit(suffix_surface, (label_surface.get_width() + digits_width, 0))
+        return readout
+
+# Render queue layers, back to front. The level start prompt stays under the ball waiting on it.
+LAYER_BOARD = 0
+LAYER_PROMPT = 1
+LAYER_SPRITES = 2
+LAYER_MESSAGES = 3
+LAYER_PADDLE = 4
+LAYER_HUD = 5
+LAYER_BANNERS = 6
+RENDER_LAYERS = 7
+
+class RenderQueue:
+    """(image, dest) pairs for one frame, submitted back to front in a single Surface.blits()."""
+
+    def __init__(self):
+        self.layers = [[] for _ in range(RENDER_LAYERS)]
+
+    def add(self, layer, image, dest):
+        self.layers[layer].append((image, dest))
+
+    def extend(self, layer, pairs):
+        self.layers[layer].extend(pairs)
+
+    def add_centered(self, layer, image, x, y):
+        self.layers[layer].append((image, image.get_rect(center=(x, y))))
+
+    def submit(self, surface, doreturn=True):
+        """Blit everything queued onto surface and empty the queue; returns the rects drawn if doreturn."""
+        blits = [pair for layer in self.layers for pair in layer]
+        for layer in self.layers:
+            layer.clear()
+        return surface.blits(blits, doreturn=doreturn)
+
+def queue_board(game, queue):
+    """Queue the bricks (the background is a fill, see change_background())."""
+    field = game.brick_field
+    if field is not None and field.texture is not None and field.alive_count:
+        # A cleared board stays until the next level starts, in the old level's colour
+        queue.add(LAYER_BOARD, field.texture, field.origin)
+    queue.extend(LAYER_BOARD, [(brick.image, brick.rect) for brick in game.bricks])
+
+def queue_overlay(game, queue, alpha=1.0):
+    """Queue everything in front of the board, moving sprites alpha of the way between the last two ticks."""
+    init_fonts()
+
+    # Level Start
+    if game.level_start:
+        queue.add_centered(LAYER_PROMPT, hud.text(f"Level {game.current_level}", large_font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50)
+        queue.add_centered(LAYER_PROMPT, hud.text("Press SPACE to Start", font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 10)
+
+    # Bricks are part of the board and always come first in all_sprites
+    bricks = game.bricks
+    sprites = [sprite for sprite in game.all_sprites if sprite not in bricks]
+    if alpha < 1.0:
+        queue.extend(LAYER_SPRITES, [(sprite.image, game.render_position(sprite, alpha)) for sprite in sprites])
+    else:
+        queue.extend(LAYER_SPRITES, [(sprite.image, sprite.rect) for sprite in sprites])
+    if game.batched_balls:
+        queue.extend(LAYER_SPRITES, game.balls.blit_list(alpha))
+    if alpha < 1.0:
+        queue.extend(LAYER_MESSAGES, [(message.image, game.render_position(message, alpha)) for message in game.messages])
+    else:
+        queue.extend(LAYER_MESSAGES, [(message.image, message.rect) for message in game.messages])
+    queue.add(LAYER_PADDLE, game.paddle.image, game.render_position(game.paddle, alpha))
+
+    # Display Score and Lives
+    queue.add(LAYER_HUD, hud.readout("Score: ", game.score), (10, 10))
+    queue.add(LAYER_HUD, hud.readout("Lives: ", game.lives), (SCREEN_WIDTH - 150, 10))
+    queue.add(LAYER_HUD, hud.readout("Level: ", game.current_level), (10, 40))
+    queue.add(LAYER_HUD, hud.readout("High Score: ", game.high_score), (SCREEN_WIDTH - 200, 40))
+    queue.add(LAYER_HUD, hud.readout("Volume: ", int(VOLUME * 100), suffix="%"), (10, 70))
+
+    # Display Pause Message
+    if game.paused:
+        queue.add_centered(LAYER_BANNERS, hud.text("PAUSED", large_font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        queue.add_centered(LAYER_BANNERS, hud.text("Press P to Resume", font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
+
+    # Game Over Message
+    if game.game_over:
+        message = "CONGRATULATIONS! YOU WIN!" if game.win else "GAME OVER"
+        queue.add_centered(LAYER_BANNERS, hud.text(message, large_font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        sub_text = "Press R to Restart or Q to Quit"
+        queue.add_centered(LAYER_BANNERS, hud.text(sub_text, font, WHITE), SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
+
+def draw_board(game, surface):
+    """Draw the background and the bricks."""
+    change_background(surface, game.current_level)
+    queue = RenderQueue()
+    queue_board(game, queue)
+    queue.submit(surface, doreturn=False)
+
+def draw_overlay(game, surface, alpha=1.0):
+    """Draw everything in front of the board and return the rects drawn."""
+    queue = RenderQueue()
+    queue_overlay(game, queue, alpha)
+    return queue.submit(surface)
+
+def draw_frame(game, surface, alpha=1.0):
+    """Draw the whole game, with moving sprites alpha of the way between the last two ticks."""
+    if not game.advanced:
+        alpha = 1.0  # Nothing moved in the last tick (paused, level start or game over)
+    change_background(surface, game.current_level)
+    queue = RenderQueue()
+    queue_board(game, queue)
+    queue_overlay(game, queue, alpha)
+    queue.submit(surface, doreturn=False)
+
+class DirtyRenderer:
+    """Draws frames by repainting only what changed since the previous one."""
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.static = surface.copy()
+        self.board_key = None
+        self.background = None
+        self.overlay_rects = []
+        self.brick_colors = {}      # Brick sprite -> colour in the static layer
+        self.field_alive = None     # BrickField alive flags and colours in the static layer
+        self.field_color = None
+
+    def draw(self, game, alpha=1.0):
+        if not game.advanced:
+            alpha = 1.0  # Nothing moved in the last tick (paused, level start or game over)
+        surface = self.surface
+        board_key = (game, game.current_level, game.brick_store)
+        if board_key != self.board_key:
+            self.board_key = board_key
+            self.render_static(game)
+            surface.blit(self.static, (0, 0))
+            dirty = [surface.get_rect()]
+        else:
+            dirty = self.update_static(game)
+            # Erase last frame's overlay and bring in patched bricks
+            surface.blits([(self.static, rect, rect) for rect in self.overlay_rects + dirty], doreturn=False)
+            dirty += self.overlay_rects
+        self.overlay_rects = draw_overlay(game, surface, alpha)
+        return dirty + self.overlay_rects
+
+    def render_static(self, game):
+        self.background = level_background(game.current_level)
+        draw_board(game, self.static)
+        field = game.brick_field
+        if field is not None:
+            self.field_alive = field.alive.copy()
+            self.field_color = field.color.copy()
+        self.brick_colors = {brick: brick.color for brick in game.bricks}
+
+    def update_static(self, game):
+        """Repaint bricks that were hit or destroyed since the last frame; returns their rects."""
+        static = self.static
+        changed = []
+        field = game.brick_field
+        if field is not None:
+            indices = np.flatnonzero((field.alive != self.field_alive) | (field.color != self.field_color).any(axis=1))
+            origin_x, origin_y = field.origin
+            for index in indices.tolist():
+                rect = field.brick_rect(index)
+                static.fill(self.background, rect)
+                if field.alive[index]:
+                    static.blit(field.texture, rect, rect.move(-origin_x, -origin_y))
+                changed.append(rect)
+            if changed:
+                self.field_alive = field.alive.copy()
+                self.field_color = field.color.copy()
+        brick_colors = {brick: brick.color for brick in game.bricks}
+        for brick in self.brick_colors.keys() - brick_colors.keys():
+            changed.append(static.fill(self.background, brick.rect))
+        for brick, color in brick_colors.items():
+            if self.brick_colors.get(brick) != color:
+                static.fill(self.background, brick.rect)
+                changed.append(static.blit(brick.image, brick.rect))
+        self.brick_colors = brick_colors
+        return changed
+
+# ========================== Frame Profiler ==========================
+PROFILER_PHASES = ('wait', 'events', 'step', 'paddle', 'sprites', 'collisions', 'draw', 'profiler', 'flip')
+PROFILER_ENTITIES = ('balls', 'bricks', 'lasers', 'powerups', 'explosions', 'messages')
+PROFILER_WINDOW = 120   # Frames in the overlay's averages and histograms
+PROFILER_BINS = 16      # Histogram bars per phase
+PROFILER_BACKGROUND = (0, 0, 0, 190)
+PROFILER_BAR_COLOR = (0, 200, 120)
+
+def entity_counts(game):
+    return {
+        'balls': len(game.balls),
+        'bricks': len(game.brick_store),
+        'lasers': len(game.lasers),
+        'powerups': len(game.all_powerups),
+        'explosions': sum(isinstance(sprite, Explosion) for sprite in game.all_sprites),
+        'messages': len(game.messages),
+    }
+
+class FrameProfiler:
+    """Per-phase frame timings for the profiler overlay and a per-frame CSV."""
+
+    def __init__(self, csv_path=None, visible=False):
+        self.visible = visible
+        self.frames = deque(maxlen=PROFILER_WINDOW)  # (phase -> ms, entity counts, ticks)
+        self.current = dict.fromkeys(PROFILER_PHASES, 0.0)
+        self.frame_count = 0
+        self.last = time.perf_counter()
+        self.font = None
+        self.csv_file = None
+        self.csv_writer = None
+        if csv_path is not None:
+            self.csv_file = open(csv_path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(('frame', 'ticks') + tuple(f"{phase}_ms" for phase in PROFILER_PHASES)
+                                     + ('total_ms',) + PROFILER_ENTITIES)
+            logging.info(f"Writing per-frame profile to {csv_path}.")
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, game, ticks):
+        timings = {phase: seconds * 1000 for phase, seconds in self.current.items()}
+        counts = entity_counts(game) if self.visible or self.csv_writer else None
+        self.frames.append((timings, counts, ticks))
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([self.frame_count, ticks] + [f"{timings[phase]:.4f}" for phase in PROFILER_PHASES]
+                                     + [f"{sum(timings.values()):.4f}"] + [counts[name] for name in PROFILER_ENTITIES])
+        self.frame_count += 1
+        self.current = dict.fromkeys(PROFILER_PHASES, 0.0)
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = self.csv_writer = None
+
+    def draw(self, surface, position=(10, 100)):
+        """Draw the overlay and return its rect."""
+        if self.font is None:
+            self.font = get_font("Arial", 14)
+        if not self.frames:
+            return pygame.Rect(position, (0, 0))
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((280, line_height * (len(PROFILER_PHASES) + 4) + 8), pygame.SRCALPHA)
+        panel.fill(PROFILER_BACKGROUND)
+
+        def text(value, x, row, right=False):
+            rendered = self.font.render(value, True, WHITE)
+            panel.blit(rendered, (x - rendered.get_width() if right else x, 4 + row * line_height))
+
+        frames = len(self.frames)
+        totals = [sum(timings.values()) for timings, _, _ in self.frames]
+        ticks = sum(frame_ticks for _, _, frame_ticks in self.frames)
+        values = {phase: [timings[phase] for timings, _, _ in self.frames] for phase in PROFILER_PHASES}
+        text(f"frame {sum(totals) / frames:.2f} ms avg, {max(totals):.2f} max, {ticks / frames:.1f} ticks", 4, 0)
+        text("avg ms", 130, 1, right=True)
+        text("max ms", 180, 1, right=True)
+        for row, phase in enumerate(PROFILER_PHASES, start=2):
+            text(phase, 4, row)
+            text(f"{sum(values[phase]) / frames:.2f}", 130, row, right=True)
+            text(f"{max(values[phase]):.2f}", 180, row, right=True)
+        counts = self.frames[-1][1]
+        if counts is not None:
+            row = len(PROFILER_PHASES) + 2
+            text(", ".join(f"{name} {counts[name]}" for name in PROFILER_ENTITIES[:3]), 4, row)
+            text(", ".join(f"{name} {counts[name]}" for name in PROFILER_ENTITIES[3:]), 4, row + 1)
+
+        # Histogram of each phase over the window, from 0 to the phase's max
+        left = panel.get_width() - PROFILER_BINS * 4 - 8
+        for row, phase in enumerate(PROFILER_PHASES, start=2):
+            peak = max(values[phase])
+            if peak <= 0:
+                continue
+            histogram, _ = np.histogram(values[phase], bins=PROFILER_BINS, range=(0, peak))
+            top = 4 + row * line_height
+            for column, count in enumerate(histogram.tolist()):
+                height = max(round(count / frames * (line_height - 2)), 1 if count else 0)
+                if height:
+                    panel.fill(PROFILER_BAR_COLOR, (left + column * 4, top + line_height - 1 - height, 3, height))
+        return surface.blit(panel, position)
 
 # ========================== Main Game Function ==========================
-def main():
-    global score, lives, game_over, win, current_level, high_score
-
-    high_score = load_high_score()
-    current_level = 1
-    score = 0
-    lives = 3
-    game_over = False
-    win = False
-    level_start = True
-
-    # Create Paddle
-    global paddle
-    paddle = Paddle()
-    # Removed adding paddle to all_sprites
+def main(tick_rate=TICK_RATE,         # Fixed physics step; frames are interpolated between the last two ticks
+         time_scale=1.0,               # Ticks run per second of wall time, relative to tick_rate
+         dirty_rects=False,            # Draw with a DirtyRenderer and only push the changed areas
+         seed=None,
+         record=None,                  # Path to save the game's Recording to on exit
+         replay=None,                  # Path to a Recording to play back instead of the keys
+         profile=False,                # Show the F3 frame profiler from the start
+         profile_csv=None,             # Path to write per-frame timings to
+         turbo=1,                      # Exactly this many ticks per frame, regardless of the clock (T cycles)
+         uncapped=False,               # No FPS limit (U toggles)
+         autopilot=False,              # An Autopilot plays instead of the keys
+         voices=SOUND_VOICE_BUDGET):   # Sounds playing at once
+    """Run the game window."""
+    startup = StartupTimer()
+    startup.mark('imports')
+    init_display()
+    startup.mark('display')
+
+    replay_events = None
+    if replay is not None:
+        recording = Recording.load(replay)
+        game = recording.create_game(headless=False)
+        replay_events = recording.events()
+        logging.info(f"Replaying {len(recording)} ticks from {replay}.")
+    else:
+        game = Game(tick_rate=tick_rate, seed=seed)
+        logging.info(f"Game seed: {game.seed}.")
+        if record is not None:
+            game.start_recording()
+    game.sounds.voice_budget = voices
+    renderer = DirtyRenderer(screen) if dirty_rects else None
+    pilot = Autopilot() if autopilot and replay_events is None else None
+    profiler = FrameProfiler(profile_csv, visible=profile)
+    game.profiler = profiler
+    tick_time = 1.0 / game.tick_rate
+    accumulator = 0.0
+    turbo = max(1, turbo)
+    startup.mark('game')
+
+    # The first frame has no text; the fonts load with the first full frame and the mixer with the first sound
+    draw_board(game, screen)
+    pygame.display.flip()
+    startup.mark('first frame')
+    startup.report()
 
     running = True
-    paused = False
+    # Key presses shorter than a frame only show up as KEYDOWN events; keep them until a tick sees them
+    space_pressed = False
+    pause_pressed = False
 
     while running:
-        clock.tick(FPS)
+        frame_time = min((clock.tick() if uncapped else clock.tick(FPS)) / 1000.0, MAX_FRAME_TIME)
+        if turbo == 1:
+            accumulator += frame_time * time_scale
+        profiler.mark('wait')
 
         # Event Handling
         for event in pygame.event.get():
@@ -848,10 +2848,18 @@ def main():
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
-                    paused = not paused
-                    logging.info(f"Game {'paused' if paused else 'resumed'} by user.")
-                elif event.key == pygame.K_SPACE and 'laser_paddle' in paddle.active_powerups:
-                    paddle.shoot_laser()
+                    pause_pressed = True
+                elif event.key == pygame.K_SPACE:
+                    space_pressed = True
+                elif event.key == pygame.K_F3:
+                    profiler.visible = not profiler.visible
+                elif event.key in (pygame.K_t, pygame.K_u):
+                    if event.key == pygame.K_t:
+                        turbo = next((level for level in TURBO_LEVELS if level > turbo), 1)
+                    else:
+                        uncapped = not uncapped
+                    accumulator = 0.0
+                    logging.info(f"Turbo x{turbo}{', uncapped' if uncapped else ''}.")
 
         keys = pygame.key.get_pressed()
 
@@ -866,91 +2874,101 @@ def main():
             if new_volume != VOLUME:
                 set_volume(new_volume)
                 logging.debug("Volume decreased by user.")
-
-        # Level Start
-        if level_start:
-            change_background(current_level)
-            draw_text(f"Level {current_level}", large_font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50)
-            draw_text("Press SPACE to Start", font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 10)
-            if keys[pygame.K_SPACE]:
-                level_start = False
-                logging.info(f"Starting level {current_level}.")
-                clear_active_powerups()
-                create_bricks(5 + current_level, 10, current_level)
-                # Reset balls
-                for ball in balls.copy():
-                    ball.kill()
-                new_ball = Ball(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, speed_increment=0.1 * current_level)
-                balls.add(new_ball)
-                all_sprites.add(new_ball)
-                logging.debug("New ball created for the new level.")
-                # Center the paddle at the start of the level
-                paddle.center_paddle()
-        elif not game_over:
-            if not paused:
-                paddle.update(keys)
-                all_sprites.update()
-                messages.update()
-                collision_result = handle_collisions()  # Call once and store the result
-                if collision_result:
-                    level_start = True
-                    if current_level < max_levels:
-                        current_level += 1
-                        logging.info(f"Proceeding to level {current_level}.")
-                    else:
-                        win = True
-                        game_over = True
-                        logging.info("All levels completed. Player wins!")
+        profiler.mark('events')
+
+        ticks = 0
+        while ticks < turbo if turbo > 1 else accumulator >= tick_time:
+            if replay_events is not None:
+                inputs = next(replay_events, NO_INPUT)
+                if inputs is None:
+                    game.reset()
+                    continue
+            elif pilot is not None:
+                inputs = pilot(game)
+            else:
+                inputs = Inputs(left=keys[pygame.K_LEFT],
+                                right=keys[pygame.K_RIGHT],
+                                space=keys[pygame.K_SPACE] or space_pressed,
+                                pause=keys[pygame.K_p] or pause_pressed)
+            game.step(inputs)
+            ticks += 1
+            space_pressed = False
+            pause_pressed = False
+            accumulator -= tick_time
+        if turbo > 1:
+            accumulator = tick_time  # Draw the last tick as is
+        profiler.mark('step')
 
         # Drawing
-        if not level_start:
-            change_background(current_level)
-
-        all_sprites.draw(screen)
-        messages.draw(screen)
-        screen.blit(paddle.image, paddle.rect)  # Draw paddle separately
-
-        # Display Score and Lives
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        lives_text = font.render(f"Lives: {lives}", True, WHITE)
-        level_text = font.render(f"Level: {current_level}", True, WHITE)
-        high_score_text = font.render(f"High Score: {high_score}", True, WHITE)
-        volume_text = font.render(f"Volume: {int(VOLUME * 100)}%", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        screen.blit(lives_text, (SCREEN_WIDTH - 150, 10))
-        screen.blit(level_text, (10, 40))
-        screen.blit(high_score_text, (SCREEN_WIDTH - 200, 40))
-        screen.blit(volume_text, (10, 70))
-
-        # Display Pause Message
-        if paused:
-            draw_text("PAUSED", large_font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-            draw_text("Press P to Resume", font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
-
-        # Game Over Message
-        if game_over:
-            message = "CONGRATULATIONS! YOU WIN!" if win else "GAME OVER"
-            draw_text(message, large_font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-            sub_text = "Press R to Restart or Q to Quit"
-            draw_text(sub_text, font, WHITE, screen, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50)
-
-            if keys[pygame.K_r]:
-                reset_game()
-                level_start = True
+        if renderer is not None:
+            dirty = renderer.draw(game, alpha=accumulator / tick_time)
+        else:
+            draw_frame(game, screen, alpha=accumulator / tick_time)
+        extra_rects = []
+        if turbo > 1 or uncapped:
+            extra_rects.append(hud.draw_text(f"Turbo x{turbo}{' (uncapped)' if uncapped else ''}", font, WHITE,
+                                             screen, SCREEN_WIDTH / 2, 20))
+        profiler.mark('draw')
+        if profiler.visible:
+            extra_rects.append(profiler.draw(screen))
+        if renderer is not None:
+            # Drawn after the renderer's overlay, so it has to erase them next frame too
+            renderer.overlay_rects += extra_rects
+            dirty += extra_rects
+        profiler.mark('profiler')
+
+        if game.game_over:
+            if keys[pygame.K_r] and replay_events is None:
+                game.reset()
+                # Reset Volume
+                set_volume(0.1)
+                logging.debug("Volume reset to default.")
             if keys[pygame.K_q]:
                 logging.info("Quit event received via Q key. Exiting game.")
                 running = False
 
-        pygame.display.flip()
-
+        if renderer is not None:
+            pygame.display.update(dirty)
+        else:
+            pygame.display.flip()
+        profiler.mark('flip')
+        profiler.end_frame(game, ticks)
+
+    profiler.close()
+    logging.info(f"Sounds: {game.sounds.stats()}.")
+    if game.recording is not None:
+        game.recording.save(record)
     pygame.quit()
     logging.info("Pygame quit. Game terminated.")
     sys.exit()
 
 # ========================== Entry Point ==========================
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Breakout")
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE, help="Physics ticks per simulated second.")
+    parser.add_argument('--time-scale', type=float, default=1.0, help="Simulated seconds per real second.")
+    parser.add_argument('--seed', type=int, help="Seed for the game's random number generator.")
+    parser.add_argument('--record', metavar='PATH', help="Save the game's seed and inputs to PATH on exit.")
+    parser.add_argument('--replay', metavar='PATH', help="Play back a recording saved with --record.")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="Redraw and update only the parts of the screen that changed each frame.")
+    parser.add_argument('--threaded-logging', action='store_true',
+                        help="Format and write log records on a background thread instead of the game loop.")
+    parser.add_argument('--profile', action='store_true', help="Show the frame profiler overlay (toggle with F3).")
+    parser.add_argument('--profile-csv', metavar='PATH', help="Write per-frame phase timings and entity counts to PATH.")
+    parser.add_argument('--turbo', type=int, default=1, metavar='N',
+                        help="Run N physics ticks per rendered frame (fast-forward; T cycles it in game).")
+    parser.add_argument('--uncapped', action='store_true', help=f"Don't limit rendering to {FPS} FPS (U toggles it).")
+    parser.add_argument('--autopilot', action='store_true', help="Let the built-in Autopilot play.")
+    parser.add_argument('--voices', type=int, default=SOUND_VOICE_BUDGET, help="Most game sounds playing at once.")
+    args = parser.parse_args()
+
+    configure_logging(threaded=args.threaded_logging)
     try:
-        main()
+        main(tick_rate=args.tick_rate, time_scale=args.time_scale, dirty_rects=args.dirty_rects,
+             seed=args.seed, record=args.record, replay=args.replay,
+             profile=args.profile, profile_csv=args.profile_csv, turbo=args.turbo, uncapped=args.uncapped,
+             autopilot=args.autopilot, voices=args.voices)
     except Exception as e:
         logging.exception("An unexpected error occurred during the game execution.")
         pygame.quit()